@@ -0,0 +1,40 @@
+# SPDX-Identifier: gpl-2.0-or-later
+# Copyright (C) 2026, Red Hat, Inc.
+#
+# Licensed under the terms of the GNU General Public License as published
+# by the Free Software Foundation; either version 2 of the License, or
+# (at your option) any later version.  You may obtain a copy of the
+# license at
+#
+#    https://www.gnu.org/licenses/old-licenses/gpl-2.0.html
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# License for the specific language governing permissions and limitations
+# under the License.
+
+"""Fastest-available JSON codec.
+
+Prefers orjson, then ujson, then the stdlib, so environments that
+cannot install orjson's Rust wheel still get a C codec.  dumps()
+always returns bytes regardless of backend so callers never branch.
+"""
+
+try:
+    import orjson
+
+    def dumps(data):
+        return orjson.dumps(data)
+
+    loads = orjson.loads
+except ImportError:
+    try:
+        import ujson as _json
+    except ImportError:
+        import json as _json
+
+    def dumps(data):
+        return _json.dumps(data).encode("utf-8")
+
+    loads = _json.loads
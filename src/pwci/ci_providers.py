@@ -0,0 +1,646 @@
+# SPDX-Identifier: gpl-2.0-or-later
+# Copyright (C) 2026, Red Hat, Inc.
+#
+# Licensed under the terms of the GNU General Public License as published
+# by the Free Software Foundation; either version 2 of the License, or
+# (at your option) any later version.  You may obtain a copy of the
+# license at
+#
+#    https://www.gnu.org/licenses/old-licenses/gpl-2.0.html
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# License for the specific language governing permissions and limitations
+# under the License.
+
+"""CI provider backends, ported from the *_mon shell scripts.
+
+Each provider wraps one CI system and exposes get_build_results(), a
+generator yielding one BuildResult per completed build that still
+needs reporting.  Its fields mirror the pw|...| lines the shell
+monitors emit: pw_instance, series_id, sha, result, build_url,
+patch_name, repo_name, test_name and patch_id.
+"""
+
+import dataclasses
+import sys
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import Optional
+from urllib.parse import quote
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+from pwci._json import dumps as _dumps, loads as _loads
+
+
+def _make_session(headers):
+    """A Session pooled and retried for bursts against one API host.
+
+    The providers issue many sequential requests to the same host per
+    poll; a bigger connection pool keeps those on long-lived
+    connections instead of re-handshaking TLS, and the retry policy
+    absorbs rate-limit and gateway hiccups.
+    """
+    session = requests.Session()
+    session.headers.update(headers)
+    adapter = HTTPAdapter(
+        pool_connections=16, pool_maxsize=64,
+        max_retries=Retry(total=3, backoff_factor=0.3,
+                          status_forcelist=[429, 502, 503, 504]))
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    return session
+
+
+@dataclasses.dataclass(slots=True)
+class BuildResult:
+    """One completed build needing a report.
+
+    Mirrors the pw|...| lines the shell monitors emit.  Slotted so a
+    large sync batch costs a third of the memory of the equivalent
+    dicts and attribute access skips the hash lookup.
+    """
+
+    pw_instance: str
+    series_id: int
+    sha: str
+    result: str
+    build_url: str
+    patch_name: str
+    repo_name: str
+    test_name: str
+    patch_id: Optional[int]
+
+    def asdict(self):
+        return dataclasses.asdict(self)
+
+
+class CIProvider:
+    """Base class for CI result providers."""
+
+    sync_column = None
+    test_label = None
+
+    def __init__(self, db, pw_instance, token=None, pw_project=None):
+        self.db = db
+        self.pw_instance = pw_instance
+        self.token = token
+        self.pw_project = pw_project
+
+    # How many synced patch ids to accumulate before flushing the
+    # batched UPDATE.
+    sync_batch_size = 50
+
+    # Thread pool width for overlapping HTTP fetches; the work is
+    # I/O bound, so the GIL is released while requests are in flight.
+    fetch_workers = 8
+
+    def get_build_results(self, builds=None):
+        """Yield a BuildResult per completed build needing a report.
+
+        Providers that track a sync column accept their pending
+        git_builds rows pre-fetched (see create_provider_bundle);
+        given None they fall back to their own table scan.
+        """
+        raise NotImplementedError
+
+    def get_logs(self, build_result):
+        """Fetch build logs in-process over the pooled session.
+
+        Providers that publish raw logs override this; returning
+        None makes CIMonitor fall back to the *_get_logs.sh script,
+        which pays a fork+exec per build.
+        """
+        return None
+
+    def _flush_synced(self, patch_ids):
+        """Mark accumulated builds reported with one batched UPDATE."""
+        if patch_ids:
+            self.db.set_builds_synced(self.pw_instance, patch_ids,
+                                      self.sync_column)
+            patch_ids.clear()
+
+    def _log(self, message):
+        print(message, file=sys.stderr)
+
+
+class GitHubActionsProvider(CIProvider):
+    """Poll GitHub Actions workflow runs, like github_mon."""
+
+    sync_column = "gap_sync"
+    test_label = "github"
+
+    def __init__(self, db, pw_instance, token=None, pw_project=None,
+                 api_base="https://api.github.com"):
+        super().__init__(db, pw_instance, token, pw_project)
+        self.api_base = api_base
+        self.graphql_url = api_base.rstrip("/") + "/graphql"
+        # GraphQL returns just the handful of fields we read instead
+        # of ~5KB per run, but it requires a token; unauthenticated
+        # use (and the fake test server) stays on REST.
+        self._prefer_graphql = bool(token)
+        if token:
+            # PyGithub costs tens of ms and real memory to import;
+            # only pay that when this provider is actually built.
+            from github import Github
+            self.github = Github(token)
+        else:
+            self.github = None
+        self.session = _make_session({
+            "Accept": "application/vnd.github.v3+json",
+            "User-Agent": "(pw-ci) github-mon",
+        })
+        if token:
+            self.session.headers["Authorization"] = "token %s" % token
+        # (series_id, sha, workflow name) -> jobs_url, recorded while
+        # iterating REST runs so get_logs can reuse the responses the
+        # scan already paid for.
+        self._jobs_urls = {}
+
+    def get_build_results(self, builds=None):
+        synced_patch_ids = []
+        self._jobs_urls.clear()
+
+        try:
+            yield from self._iter_results(synced_patch_ids, builds)
+        finally:
+            # Flush whatever accumulated, even if the consumer stopped
+            # iterating early.
+            self._flush_synced(synced_patch_ids)
+
+    def get_logs(self, build_result):
+        """Fetch the run's failed-job logs over the pooled session.
+
+        The REST runs the scan fetched carry each run's jobs_url;
+        follow it and pull the log text of every non-success job,
+        replacing the github_get_logs.sh fork per build.  GraphQL
+        runs do not expose jobs_url, so those (and unknown builds)
+        return None and take the script fallback.
+        """
+        jobs_url = self._jobs_urls.get(
+            (build_result.series_id, build_result.sha,
+             build_result.test_name))
+        if not jobs_url:
+            return None
+        try:
+            response = self.session.get(jobs_url, timeout=60)
+            response.raise_for_status()
+            pieces = []
+            for job in _loads(response.content).get("jobs", []):
+                if job.get("conclusion") in (None, "success"):
+                    continue
+                logs = self.session.get(
+                    "%s/repos/%s/actions/jobs/%s/logs"
+                    % (self.api_base, build_result.repo_name,
+                       job["id"]), timeout=60)
+                logs.raise_for_status()
+                pieces.append(logs.text)
+        except requests.RequestException:
+            return None
+        return "\n".join(pieces)
+
+    # Bound on the per-call workflow-runs cache; each entry is one
+    # parsed GitHub response.
+    runs_cache_size = 128
+
+    @staticmethod
+    def _latest_by_workflow(workflow_runs):
+        """Map sha -> workflow name -> newest run, in one pass.
+
+        Every build sharing a response only needs the newest run of
+        each workflow for its sha, so compute that once per fetch
+        instead of grouping and sorting per build.
+        """
+        latest = {}
+        for run in workflow_runs:
+            by_name = latest.setdefault(run["head_sha"], {})
+            current = by_name.get(run["name"])
+            if (current is None
+                    or run["run_started_at"] > current["run_started_at"]):
+                by_name[run["name"]] = run
+        return latest
+
+    _GRAPHQL_QUERY = """\
+query RunsForBranch($owner: String!, $name: String!, $branch: String!) {
+  repository(owner: $owner, name: $name) {
+    ref(qualifiedName: $branch) {
+      target {
+        ... on Commit {
+          oid
+          checkSuites(first: 100) {
+            nodes {
+              status
+              conclusion
+              workflowRun {
+                url
+                createdAt
+                workflow { name }
+              }
+            }
+          }
+        }
+      }
+    }
+  }
+}"""
+
+    def _fetch_runs_graphql(self, repo_name, series_id):
+        """Fetch the series branch runs via GraphQL, REST-shaped.
+
+        The REST runs list carries ~5KB per run of fields we never
+        read; the GraphQL query returns only the five we do.  The
+        nodes are normalized into the same run dicts the REST path
+        produces so the build loop cannot tell them apart.
+        """
+        owner, _, name = repo_name.partition("/")
+        variables = {"owner": owner, "name": name,
+                     "branch": "refs/heads/series_%s" % series_id}
+        response = self.session.post(
+            self.graphql_url,
+            data=_dumps({"query": self._GRAPHQL_QUERY,
+                         "variables": variables}))
+        details = _loads(response.content)
+        target = details["data"]["repository"]["ref"]["target"]
+        runs = []
+        for node in target["checkSuites"]["nodes"]:
+            workflow_run = node["workflowRun"]
+            if workflow_run is None:
+                continue
+            conclusion = node["conclusion"]
+            runs.append({
+                "name": workflow_run["workflow"]["name"],
+                "head_sha": target["oid"],
+                "status": (node["status"] or "").lower(),
+                "conclusion": conclusion.lower() if conclusion else None,
+                "html_url": workflow_run["url"],
+                "run_started_at": workflow_run["createdAt"],
+            })
+        return {"workflow_runs": runs,
+                "_latest_by_workflow": self._latest_by_workflow(runs)}
+
+    def _fetch_runs(self, repo_name, series_id):
+        """Fetch and pre-digest the workflow runs for one series."""
+        if self._prefer_graphql:
+            try:
+                return self._fetch_runs_graphql(repo_name, series_id)
+            except (KeyError, TypeError, ValueError):
+                self._log("GraphQL runs query failed for "
+                          f"{repo_name} series_{series_id}; "
+                          "falling back to REST")
+                self._prefer_graphql = False
+        url = (f"{self.api_base}/repos/{repo_name}/actions/runs"
+               f"?branch=series_{series_id}&per_page=100")
+        response = self.session.get(url)
+        all_runs = _loads(response.content)
+        if "workflow_runs" in all_runs:
+            all_runs["_latest_by_workflow"] = \
+                self._latest_by_workflow(all_runs["workflow_runs"])
+        return all_runs
+
+    def _iter_results(self, synced_patch_ids, builds=None):
+        if builds is None:
+            builds = self.db.get_unsynced_builds(self.pw_instance,
+                                                 self.sync_column)
+        builds = [build for build in builds
+                  if not (self.pw_project and
+                          build["patchwork_project"] != self.pw_project)]
+
+        # Parsed workflow-runs responses keyed on (repo, series), so
+        # builds interleaved by series do not refetch on every switch.
+        # An LRU bound keeps memory flat on large backlogs.  The
+        # distinct series are fetched up-front with overlapping
+        # requests rather than one serial round trip each.
+        runs_cache = OrderedDict()
+        seen = set()
+        fetch_keys = []
+        for build in builds:
+            key = (build["repo_name"], build["series_id"])
+            if key not in seen:
+                seen.add(key)
+                fetch_keys.append(key)
+        fetch_keys = fetch_keys[:self.runs_cache_size]
+        with ThreadPoolExecutor(max_workers=self.fetch_workers) as executor:
+            for key, all_runs in zip(
+                    fetch_keys,
+                    executor.map(lambda k: self._fetch_runs(*k),
+                                 fetch_keys)):
+                runs_cache[key] = all_runs
+
+        for build in builds:
+            series_id = build["series_id"]
+            repo_name = build["repo_name"]
+            cache_key = (repo_name, series_id)
+            url = (f"{self.api_base}/repos/{repo_name}/actions/runs"
+                   f"?branch=series_{series_id}&per_page=100")
+            all_runs = runs_cache.get(cache_key)
+            if all_runs is None:
+                all_runs = self._fetch_runs(repo_name, series_id)
+                runs_cache[cache_key] = all_runs
+                if len(runs_cache) > self.runs_cache_size:
+                    runs_cache.popitem(last=False)
+            else:
+                runs_cache.move_to_end(cache_key)
+
+            message = all_runs.get("message")
+            if message is not None:
+                self._log(f"'{url}' could not be reached: {message}")
+                continue
+
+            workflow_latest = all_runs.get("_latest_by_workflow", {}).get(
+                build["sha"], {})
+
+            completed = True
+            results = []
+            for workflow_name, latest_run in workflow_latest.items():
+                self._jobs_urls[(series_id, build["sha"],
+                                 workflow_name)] = \
+                    latest_run.get("jobs_url")
+                if latest_run["status"] != "completed":
+                    self._log(f"patch_id={build['patch_id']} belonging to "
+                              f"series_id={series_id} not completed. "
+                              "Skipping")
+                    completed = False
+                    break
+                conclusion = latest_run["conclusion"]
+                if conclusion == "success":
+                    result = "passed"
+                elif conclusion == "failure":
+                    result = "failed"
+                else:
+                    self._log(f"patch_id={build['patch_id']} belonging to "
+                              f"series_id={series_id} got a workflow "
+                              f"result {conclusion}")
+                    result = "warning"
+                results.append(BuildResult(
+                    pw_instance=self.pw_instance,
+                    series_id=series_id,
+                    sha=build["sha"],
+                    result=result,
+                    build_url=latest_run["html_url"],
+                    patch_name=build["patch_name"],
+                    repo_name=repo_name,
+                    test_name=workflow_name,
+                    patch_id=build["patch_id"],
+                ))
+
+            if not completed or not results:
+                continue
+
+            yield from results
+            synced_patch_ids.append(build["patch_id"])
+            if len(synced_patch_ids) >= self.sync_batch_size:
+                self._flush_synced(synced_patch_ids)
+
+
+class CirrusProvider(CIProvider):
+    """Poll Cirrus CI via its GraphQL endpoint, like cirrus_mon."""
+
+    sync_column = "cirrus_sync"
+    test_label = "cirrus"
+
+    _QUERY = """\
+query BuildBySHAQuery($owner: String!, $name: String!, $SHA: String) {
+  searchBuilds(repositoryOwner: $owner, repositoryName: $name, SHA: $SHA) {
+    id, status
+  }
+}"""
+    # The query never changes, so serialize it once and splice in only
+    # the per-build variables when building the POST body.
+    _QUERY_PREFIX = b'{"query":' + _dumps(_QUERY) + b',"variables":'
+
+    def __init__(self, db, pw_instance, token=None, pw_project=None,
+                 api_base="https://api.cirrus-ci.com/graphql"):
+        super().__init__(db, pw_instance, token, pw_project)
+        self.api_base = api_base
+        self.session = _make_session({
+            "Content-Type": "application/json",
+            "User-Agent": "(pw-ci) cirrus-mon",
+        })
+        if token:
+            self.session.headers["Authorization"] = "Bearer %s" % token
+
+    def get_build_results(self, builds=None):
+        synced_patch_ids = []
+
+        try:
+            yield from self._iter_results(synced_patch_ids, builds)
+        finally:
+            self._flush_synced(synced_patch_ids)
+
+    def _fetch_details(self, build):
+        """POST the BuildBySHAQuery for one build and parse the reply."""
+        owner, _, name = build["repo_name"].partition("/")
+        variables = {"owner": owner, "name": name, "SHA": build["sha"]}
+        body = self._QUERY_PREFIX + _dumps(variables) + b"}"
+        response = self.session.post(self.api_base, data=body)
+        return _loads(response.content)
+
+    def _iter_results(self, synced_patch_ids, builds=None):
+        if builds is None:
+            builds = self.db.get_unsynced_builds(self.pw_instance,
+                                                 self.sync_column)
+        pending = [build for build in builds
+                   if not (self.pw_project and
+                           build["patchwork_project"] != self.pw_project)]
+
+        # The GraphQL POSTs are independent, so overlap them; map()
+        # keeps the results in build order.
+        with ThreadPoolExecutor(max_workers=self.fetch_workers) as executor:
+            details_list = list(executor.map(self._fetch_details, pending))
+
+        for build, details in zip(pending, details_list):
+            patch_id = build["patch_id"]
+            series_id = build["series_id"]
+
+            builds = (details.get("data") or {}).get("searchBuilds") or []
+            if not builds:
+                # Nothing will ever show up for this sha; stop asking.
+                synced_patch_ids.append(patch_id)
+                self._log(f"CIRRUS patch_id={patch_id} is cleared "
+                          "(no builds)")
+                continue
+
+            status = builds[-1]["status"]
+            build_url = "https://cirrus-ci.com/build/%s" % builds[-1]["id"]
+
+            if status == "COMPLETED":
+                result = "passed"
+            elif status == "FAILED":
+                result = "failed"
+            elif status == "ERRORED":
+                result = "warning"
+            elif status == "ABORTED":
+                synced_patch_ids.append(patch_id)
+                self._log(f"CIRRUS patch_id={patch_id} belonging to "
+                          f"series={series_id} was aborted")
+                continue
+            else:
+                self._log(f"CIRRUS patch_id={patch_id} belonging to "
+                          f"series={series_id} is not completed"
+                          f"[{status}]. Skipping")
+                continue
+
+            yield BuildResult(
+                pw_instance=self.pw_instance,
+                series_id=series_id,
+                sha=build["sha"],
+                result=result,
+                build_url=build_url,
+                patch_name=build["patch_name"],
+                repo_name=build["repo_name"],
+                test_name=self.test_label,
+                patch_id=patch_id,
+            )
+            synced_patch_ids.append(patch_id)
+            if len(synced_patch_ids) >= self.sync_batch_size:
+                self._flush_synced(synced_patch_ids)
+
+
+class TravisProvider(CIProvider):
+    """Poll Travis CI branch builds, like travis_mon."""
+
+    test_label = "travis"
+
+    def __init__(self, db, pw_instance, token=None, pw_project=None,
+                 api_base="https://api.travis-ci.com"):
+        super().__init__(db, pw_instance, token, pw_project)
+        self.api_base = api_base
+        self.session = _make_session({
+            "Travis-API-Version": "3",
+            "User-Agent": "(pw-ci) travis-mon",
+        })
+        if token:
+            self.session.headers["Authorization"] = "token %s" % token
+
+    def _get_builds_for_branch(self, repo, branch):
+        url = (f"{self.api_base}/repo/{quote(repo, safe='')}/builds"
+               f"?branch.name={branch}")
+        response = self.session.get(url)
+        return _loads(response.content).get("builds", [])
+
+    def get_build_results(self, builds=None):
+        # Travis pending work lives in branches, not git_builds, so
+        # pre-fetched rows do not apply.
+        branches = [branch for branch
+                    in self.db.get_active_branches(self.pw_instance)
+                    if not (self.pw_project and
+                            branch["series_project"] != self.pw_project)]
+
+        # Each branch costs one Travis round trip; overlap them and
+        # yield per branch as its fetch completes.
+        with ThreadPoolExecutor(max_workers=self.fetch_workers) as executor:
+            future_map = {
+                executor.submit(self._get_builds_for_branch,
+                                branch["series_repo"],
+                                branch["series_branch"]): branch
+                for branch in branches}
+            for future in as_completed(future_map):
+                yield from self._branch_results(future_map[future],
+                                                future.result())
+
+    def _branch_results(self, branch, builds):
+        series_id = branch["series_id"]
+        repo = branch["series_repo"]
+        for build in builds:
+            state = build.get("state")
+            if state not in ("failed", "passed", "errored"):
+                continue
+            yield BuildResult(
+                pw_instance=self.pw_instance,
+                series_id=series_id,
+                sha=build.get("commit", {}).get("sha", ""),
+                result="warning" if state == "errored" else state,
+                build_url="https://travis-ci.com/%s/builds/%s"
+                          % (repo, build["id"]),
+                patch_name=build.get("commit", {}).get("message", ""),
+                repo_name=repo,
+                test_name=self.test_label,
+                patch_id=None,
+            )
+            self.db.clear_branch(self.pw_instance, series_id)
+
+
+class DummyProvider(CIProvider):
+    """Emit canned results for testing, like dummy_mon."""
+
+    sync_column = "dummy_sync"
+    test_label = "dummy"
+
+    def get_build_results(self, builds=None):
+        if self.token != "emit":
+            return
+        synced_patch_ids = []
+
+        try:
+            yield from self._iter_results(synced_patch_ids, builds)
+        finally:
+            self._flush_synced(synced_patch_ids)
+
+    def _iter_results(self, synced_patch_ids, builds=None):
+        if builds is None:
+            # Materialize like the other providers: the batched sync
+            # flush writes the column this scan's cursor is walking.
+            builds = list(self.db.get_unsynced_builds(self.pw_instance,
+                                                      self.sync_column))
+        for build in builds:
+            if (self.pw_project
+                    and build["patchwork_project"] != self.pw_project):
+                continue
+            yield BuildResult(
+                pw_instance=self.pw_instance,
+                series_id=build["series_id"],
+                sha=build["sha"],
+                result="passed",
+                build_url="http://foo.com/%s/%s"
+                          % (build["patchwork_project"],
+                             build["series_id"]),
+                patch_name=build["patch_name"],
+                repo_name=build["repo_name"],
+                test_name=self.test_label,
+                patch_id=build["patch_id"],
+            )
+            synced_patch_ids.append(build["patch_id"])
+            if len(synced_patch_ids) >= self.sync_batch_size:
+                self._flush_synced(synced_patch_ids)
+
+
+PROVIDERS = {
+    "github": GitHubActionsProvider,
+    "cirrus": CirrusProvider,
+    "travis": TravisProvider,
+    "dummy": DummyProvider,
+}
+
+
+def create_provider(name, db, pw_instance, token=None, pw_project=None):
+    """Instantiate the provider registered under name."""
+    try:
+        cls = PROVIDERS[name]
+    except KeyError:
+        raise ValueError("unknown CI provider: %s" % name) from None
+    return cls(db, pw_instance, token=token, pw_project=pw_project)
+
+
+def create_provider_bundle(pw_instance, providers, db):
+    """Yield (provider, build) pairs from one shared git_builds query.
+
+    Running several providers against the same instance otherwise
+    costs one near-identical table scan each; fetching the union once
+    and fanning rows out by sync column amortizes the round trips.
+    Providers that do not track a sync column (Travis) are skipped
+    since their pending work does not live in git_builds.
+    """
+    columns = [provider.sync_column for provider in providers
+               if provider.sync_column]
+    if not columns:
+        return
+    builds = db.get_all_unsynced_builds_for_providers(pw_instance, columns)
+    for build in builds:
+        for provider in providers:
+            column = provider.sync_column
+            if column and build[column] == 0:
+                yield provider, build
@@ -0,0 +1,284 @@
+# SPDX-Identifier: gpl-2.0-or-later
+# Copyright (C) 2026, Red Hat, Inc.
+#
+# Licensed under the terms of the GNU General Public License as published
+# by the Free Software Foundation; either version 2 of the License, or
+# (at your option) any later version.  You may obtain a copy of the
+# license at
+#
+#    https://www.gnu.org/licenses/old-licenses/gpl-2.0.html
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# License for the specific language governing permissions and limitations
+# under the License.
+
+"""pwci command line interface.
+
+Only click is imported at module scope; everything else is pulled in
+inside the command that needs it, so `pwci --help` and shell
+completion never pay for sqlite3, requests or jinja2.  Commands are
+likewise built on demand: each one lives in a factory and only the
+subcommand named on argv gets its Option objects constructed.
+"""
+
+import functools
+import os
+import re
+import sys
+from pathlib import Path
+
+import click
+
+# The same RC files the shell scripts source, in the same order.
+CONFIG_FILES = [".pwmon-rc", ".cimon-rc"]
+
+# Home is resolved once and its entries listed once; one scandir
+# replaces a stat per candidate RC file on every load_config call.
+_HOME = None
+_HOME_ENTRIES = None
+
+
+def _home_paths():
+    global _HOME, _HOME_ENTRIES
+    if _HOME is None:
+        _HOME = Path.home()
+        _HOME_ENTRIES = {entry.name for entry in os.scandir(_HOME)}
+    return [_HOME / name for name in CONFIG_FILES
+            if name in _HOME_ENTRIES]
+
+# One pass over the raw bytes beats per-line strip/split/strip.
+_CFG_RE = re.compile(
+    rb'(?m)^[ \t]*(?!#)([A-Za-z_][A-Za-z0-9_]*)[ \t]*='
+    rb'[ \t]*["\']?([^"\'\r\n]*?)["\']?[ \t]*$')
+
+
+@functools.lru_cache(maxsize=8)
+def _parse_one(path_str, mtime_ns):
+    """Parse one RC file; cached until the file's mtime changes."""
+    del mtime_ns  # only part of the cache key
+    with open(path_str, "rb") as handle:
+        data = handle.read()
+    return {match.group(1).decode(): match.group(2).decode()
+            for match in _CFG_RE.finditer(data)}
+
+
+def load_config(config_file=None, required=None):
+    """Merge VAR=value settings from the RC files, like the shell.
+
+    When the caller names the keys it will consult, parsing stops at
+    the first file that resolves them all, skipping later RC files.
+    """
+    config = {}
+    if config_file:
+        paths = [Path(config_file)]
+    else:
+        paths = _home_paths()
+    for config_path in paths:
+        try:
+            mtime_ns = os.stat(config_path).st_mtime_ns
+        except OSError:
+            continue
+        config.update(_parse_one(str(config_path), mtime_ns))
+        if required and required <= config.keys():
+            break
+    return config
+
+
+@click.group()
+def cli():
+    """Patchwork CI monitoring tools."""
+
+
+def _build_monitor():
+    @click.command()
+    @click.option("--pw-instance", help="Patchwork instance URL.")
+    @click.option("--pw-project", help="Patchwork project name.")
+    @click.option("--pw-credentials",
+                  help="user:password for the web client.")
+    @click.option("--add-filter-recheck", "recheck_filters", multiple=True,
+                  help="Recheck label to honor (repeatable).")
+    @click.option("--config-file", help="Alternate RC file.")
+    def monitor(pw_instance, pw_project, pw_credentials, recheck_filters,
+                config_file):
+        """Watch a Patchwork instance for new series, like pw_mon."""
+        from .database import SeriesDatabase
+        from .patchwork import PatchworkClient, PatchworkMonitor
+
+        config = load_config(config_file,
+                             required={"pw_instance", "pw_project",
+                                       "pw_credential"})
+        pw_instance = pw_instance or config.get("pw_instance")
+        pw_project = pw_project or config.get("pw_project")
+        pw_credentials = pw_credentials or config.get("pw_credential")
+        if not pw_instance or not pw_project:
+            raise click.UsageError(
+                "pw_instance and pw_project must be set "
+                "(RC file or options)")
+
+        db = SeriesDatabase()
+        client = PatchworkClient(pw_instance, credentials=pw_credentials,
+                                 pw_project=pw_project)
+        PatchworkMonitor(client, db, pw_instance, pw_project,
+                         recheck_filters=list(recheck_filters)).run()
+
+    return monitor
+
+
+def _build_ci_monitor():
+    @click.command()
+    @click.option("--pw-instance", help="Patchwork instance URL.")
+    @click.option("--pw-project", help="Patchwork project name.")
+    @click.option("--providers", default="github",
+                  help="Comma separated CI providers to scan.")
+    @click.option("--to-addr", help="Report recipient.")
+    @click.option("--from-addr", help="Report sender.")
+    @click.option("--url-filter", default=None,
+                  help="sed-style s/pat/rep/ patch URL transform.")
+    @click.option("--post-result", is_flag=True,
+                  help="Also post results via the provider script.")
+    @click.option("--dry-run", is_flag=True, help="Do not send anything.")
+    @click.option("--config-file", help="Alternate RC file.")
+    def ci_monitor(pw_instance, pw_project, providers, to_addr, from_addr,
+                   url_filter, post_result, dry_run, config_file):
+        """Report completed CI builds to the list, like ci_mon."""
+        from .ci_providers import create_provider
+        from .database import SeriesDatabase
+        from .email import EmailReporter
+        from .monitor import CIMonitor
+        from .patchwork import PatchworkClient
+
+        required = {"pw_instance", "pw_project", "to_addr", "from_addr",
+                    "RPT_SUCCESS", "RPT_FAILURE", "RPT_WARNING",
+                    "post_result_script"}
+        for name in providers.split(","):
+            name = name.strip()
+            required.add("disable_%s" % name)
+            required.add("%s_token" % name)
+        config = load_config(config_file, required=required)
+        pw_instance = pw_instance or config.get("pw_instance")
+        pw_project = pw_project or config.get("pw_project")
+        to_addr = to_addr or config.get("to_addr")
+        from_addr = from_addr or config.get("from_addr")
+        if not pw_instance:
+            raise click.UsageError(
+                "pw_instance must be set (RC file or options)")
+
+        db = SeriesDatabase()
+        provider_list = []
+        for name in providers.split(","):
+            name = name.strip()
+            if config.get("disable_%s" % name) == "yes":
+                click.echo("Skipping %s" % name)
+                continue
+            provider_list.append(create_provider(
+                name, db, pw_instance,
+                token=config.get("%s_token" % name),
+                pw_project=pw_project))
+
+        reporter = EmailReporter(
+            to_addr, from_addr, dry_run=dry_run,
+            report_success=config.get("RPT_SUCCESS", "SUCCESS"),
+            report_failure=config.get("RPT_FAILURE", "FAILURE"),
+            report_warning=config.get("RPT_WARNING", "WARNING"))
+        client = PatchworkClient(pw_instance, pw_project=pw_project)
+        CIMonitor(db, provider_list, reporter, client,
+                  url_filter=url_filter, post_result=post_result,
+                  post_result_script=(
+                      config.get("post_result_script") == "yes"),
+                  dry_run=dry_run).monitor_ci_systems()
+
+    return ci_monitor
+
+
+def _build_series_info():
+    @click.command()
+    @click.argument("series_id", type=int)
+    @click.option("--pw-instance", help="Patchwork instance URL.")
+    @click.option("--config-file", help="Alternate RC file.")
+    def series_info(series_id, pw_instance, config_file):
+        """Show what Patchwork and the local DB know about a series."""
+        from .database import SeriesDatabase
+        from .patchwork import PatchworkClient
+
+        config = load_config(config_file,
+                             required={"pw_instance"})
+        pw_instance = pw_instance or config.get("pw_instance")
+        if not pw_instance:
+            raise click.UsageError(
+                "pw_instance must be set (RC file or options)")
+
+        client = PatchworkClient(pw_instance)
+        series = client.get_series(series_id)
+        db = SeriesDatabase.open_readonly()
+        click.echo("%s|%s|%s|%s" % (
+            series["id"], series["name"],
+            (series.get("submitter") or {}).get("email", ""),
+            "known" if db.series_exists(pw_instance, series_id)
+            else "unknown"))
+
+    return series_info
+
+
+def _build_list_series():
+    @click.command()
+    @click.option("--pw-instance", help="Patchwork instance URL.")
+    @click.option("--config-file", help="Alternate RC file.")
+    def list_series(pw_instance, config_file):
+        """List series the local DB is still tracking."""
+        from .database import SeriesDatabase
+
+        config = load_config(config_file,
+                             required={"pw_instance"})
+        pw_instance = pw_instance or config.get("pw_instance")
+        if not pw_instance:
+            raise click.UsageError(
+                "pw_instance must be set (RC file or options)")
+
+        db = SeriesDatabase.open_readonly()
+        for row in db.get_uncompleted_series(pw_instance):
+            click.echo("%s|%s|%s|%s" % (
+                row["series_id"], row["series_project"],
+                row["series_submitter"], row["series_url"]))
+
+    return list_series
+
+
+_FACTORIES = {
+    "monitor": _build_monitor,
+    "ci-monitor": _build_ci_monitor,
+    "series-info": _build_series_info,
+    "list-series": _build_list_series,
+}
+
+
+def _sniff_subcommand(args):
+    """The subcommand named on argv, or None when unsure."""
+    for arg in args:
+        if arg.startswith("-"):
+            # A leading option (--help and friends) needs the full
+            # command tree.
+            return None
+        return arg
+    return None
+
+
+def _register_commands(args):
+    """Build only the invoked command's parser when possible."""
+    sub = _sniff_subcommand(args)
+    factory = _FACTORIES.get(sub)
+    if factory is not None:
+        cli.add_command(factory())
+        return
+    for factory in _FACTORIES.values():
+        cli.add_command(factory())
+
+
+def main():
+    _register_commands(sys.argv[1:])
+    cli()
+
+
+if __name__ == "__main__":
+    main()
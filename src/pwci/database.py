@@ -0,0 +1,502 @@
+# SPDX-Identifier: gpl-2.0-or-later
+# Copyright (C) 2026, Red Hat, Inc.
+#
+# Licensed under the terms of the GNU General Public License as published
+# by the Free Software Foundation; either version 2 of the License, or
+# (at your option) any later version.  You may obtain a copy of the
+# license at
+#
+#    https://www.gnu.org/licenses/old-licenses/gpl-2.0.html
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# License for the specific language governing permissions and limitations
+# under the License.
+
+"""Sqlite state tracking, ported from series_db_lib.sh.
+
+The database lives at ~/.series-db by default, the same file the shell
+scripts use, and the tables keep the series_db_lib.sh layout so the
+shell and Python tooling can operate on the same state.
+"""
+
+import contextlib
+import os
+import sqlite3
+import threading
+from datetime import datetime
+
+def default_db_path():
+    """The shared ~/.series-db, resolved against the current $HOME.
+
+    Resolved per call rather than at import so tests (and anything
+    else re-pointing HOME) reach their own database.
+    """
+    return os.path.join(os.path.expanduser("~"), ".series-db")
+
+# Matches the series_db_upgrade layout from series_db_lib.sh.
+_SCHEMA_DDL = """\
+CREATE TABLE IF NOT EXISTS series (
+series_id INTEGER,
+series_project TEXT NOT NULL,
+series_url TEXT NOT NULL,
+series_submitter TEXT NOT NULL,
+series_email TEXT NOT NULL,
+series_submitted BOOLEAN,
+series_completed INTEGER,
+series_instance TEXT NOT NULL DEFAULT 'none',
+series_downloaded INTEGER,
+series_branch TEXT,
+series_repo TEXT,
+series_sha TEXT);
+CREATE TABLE IF NOT EXISTS git_builds (
+series_id INTEGER,
+patch_id INTEGER,
+patch_url STRING,
+patch_name STRING,
+sha STRING,
+patchwork_instance STRING,
+patchwork_project STRING,
+repo_name STRING,
+gap_sync INTEGER,
+obs_sync INTEGER,
+cirrus_sync INTEGER,
+dummy_sync INTEGER);
+CREATE TABLE IF NOT EXISTS recheck_requests (
+recheck_id INTEGER,
+recheck_message_id STRING,
+recheck_requested_by STRING,
+recheck_series STRING,
+recheck_patch INTEGER,
+patchwork_instance STRING,
+patchwork_project STRING,
+recheck_sync INTEGER);
+CREATE TABLE IF NOT EXISTS check_id_scanned (
+check_patch_id INTEGER,
+check_url STRING);
+CREATE TABLE IF NOT EXISTS pw_monitor_state (
+pw_instance STRING,
+pw_project STRING,
+last_check_ts STRING);
+CREATE UNIQUE INDEX IF NOT EXISTS idx_monitor_state_unique
+ON pw_monitor_state(pw_instance, pw_project);
+CREATE INDEX IF NOT EXISTS idx_series_instance_id
+ON series(series_instance, series_id);
+CREATE UNIQUE INDEX IF NOT EXISTS idx_series_unique
+ON series(series_instance, series_id);
+CREATE INDEX IF NOT EXISTS idx_series_inst_proj_state
+ON series(series_instance, series_project, series_completed,
+series_submitted, series_downloaded);
+CREATE INDEX IF NOT EXISTS idx_git_builds_lookup
+ON git_builds(patchwork_instance, series_id, sha);
+CREATE INDEX IF NOT EXISTS idx_git_builds_inst_gap
+ON git_builds(patchwork_instance, gap_sync, series_id);
+CREATE INDEX IF NOT EXISTS idx_git_builds_inst_obs
+ON git_builds(patchwork_instance, obs_sync, series_id);
+CREATE INDEX IF NOT EXISTS idx_git_builds_inst_cirrus
+ON git_builds(patchwork_instance, cirrus_sync, series_id);
+CREATE INDEX IF NOT EXISTS idx_git_builds_inst_dummy
+ON git_builds(patchwork_instance, dummy_sync, series_id);
+"""
+
+# The only column names callers may splice into sync queries.
+_SYNC_COLUMNS = frozenset(
+    {"gap_sync", "obs_sync", "cirrus_sync", "dummy_sync"})
+
+# db paths whose schema this process has already ensured; repeat
+# SeriesDatabase construction is then free.
+_SCHEMA_READY = set()
+
+# Hoisted so sqlite's statement cache sees the same text every call.
+_SQL_SERIES_EXISTS = (
+    "SELECT EXISTS(SELECT 1 FROM series WHERE series_id = ? "
+    "AND series_instance = ?)")
+_SQL_UNSUBMITTED_SERIES = (
+    "SELECT * FROM series WHERE series_instance = ? "
+    "AND series_submitted = 0")
+_SQL_SET_SUBMITTED = (
+    "UPDATE series SET series_submitted = 1 "
+    "WHERE series_id = ? AND series_instance = ?")
+_SQL_UNCOMPLETED_SERIES = (
+    "SELECT * FROM series WHERE series_instance = ? "
+    "AND series_completed = 0")
+_SQL_SET_COMPLETED = (
+    "UPDATE series SET series_completed = 1 "
+    "WHERE series_id = ? AND series_instance = ?")
+_SQL_PATCH_ID_BY_SHA = (
+    "SELECT patch_id FROM git_builds "
+    "WHERE patchwork_instance = ? AND series_id = ? AND sha = ?")
+_SQL_RECHECK_EXISTS = (
+    "SELECT recheck_id FROM recheck_requests "
+    "WHERE patchwork_instance = ? AND recheck_message_id = ? "
+    "AND recheck_patch = ?")
+_SQL_INSERT_RECHECK = (
+    "INSERT INTO recheck_requests (recheck_id, recheck_message_id, "
+    "recheck_requested_by, recheck_series, recheck_patch, "
+    "patchwork_instance, patchwork_project, recheck_sync) "
+    "VALUES (?, ?, ?, ?, ?, ?, ?, 0)")
+_SQL_SET_SERIES_SYNCED = (
+    "UPDATE git_builds SET gap_sync = 1, obs_sync = 1, "
+    "cirrus_sync = 1, dummy_sync = 1 "
+    "WHERE patchwork_instance = ? AND series_id = ?")
+_SQL_ACTIVE_BRANCHES = (
+    "SELECT series_id, series_project, series_url, series_branch, "
+    "series_repo FROM series WHERE series_instance = ? "
+    "AND series_branch IS NOT NULL AND series_branch != ''")
+_SQL_ACTIVATE_BRANCH = (
+    "UPDATE series SET series_branch = ?, series_repo = ? "
+    "WHERE series_id = ? AND series_instance = ?")
+_SQL_CLEAR_BRANCH = (
+    "UPDATE series SET series_branch = '' "
+    "WHERE series_id = ? AND series_instance = ?")
+_SQL_CACHED_PATCH_INFO = (
+    "SELECT b.patch_id, b.patch_url, b.patch_name, "
+    "s.series_submitter, s.series_email "
+    "FROM git_builds b JOIN series s "
+    "ON s.series_instance = b.patchwork_instance "
+    "AND s.series_id = b.series_id "
+    "WHERE b.patchwork_instance = ? AND b.series_id = ? "
+    "AND b.patch_id = ?")
+_SQL_GET_LAST_CHECK = (
+    "SELECT last_check_ts FROM pw_monitor_state "
+    "WHERE pw_instance = ? AND pw_project = ?")
+_SQL_SET_LAST_CHECK = (
+    "INSERT OR REPLACE INTO pw_monitor_state "
+    "(pw_instance, pw_project, last_check_ts) VALUES (?, ?, ?)")
+_SQL_INSERT_SERIES = (
+    "INSERT OR IGNORE INTO series "
+    "(series_id, series_project, series_url, "
+    "series_submitter, series_email, series_submitted, "
+    "series_completed, series_instance) "
+    "VALUES (?, ?, ?, ?, ?, 0, 0, ?)")
+_SQL_INSERT_BUILD = (
+    "INSERT INTO git_builds (series_id, patch_id, patch_url, "
+    "patch_name, sha, patchwork_instance, patchwork_project, "
+    "repo_name, gap_sync, obs_sync, cirrus_sync, dummy_sync) "
+    "VALUES (?, ?, ?, ?, ?, ?, ?, ?, 0, 0, 0, 0)")
+
+# One precomputed statement per sync column; a dict miss rejects
+# anything that is not a known column, replacing per-call f-strings.
+_UNSYNCED_SQL = {
+    column: ("SELECT series_id, patch_id, patch_url, patch_name, "
+             "sha, patchwork_project, repo_name FROM git_builds "
+             "WHERE patchwork_instance = ? "
+             "AND %s = 0 ORDER BY series_id" % column)
+    for column in _SYNC_COLUMNS}
+_SET_SYNCED_SQL = {
+    column: ("UPDATE git_builds SET %s = 1 "
+             "WHERE patchwork_instance = ? AND patch_id = ?" % column)
+    for column in _SYNC_COLUMNS}
+_SET_SYNCED_BATCH_SQL = {
+    column: ("UPDATE git_builds SET %s = 1 "
+             "WHERE patchwork_instance = ? AND patch_id IN (%%s)"
+             % column)
+    for column in _SYNC_COLUMNS}
+# Fragments spliced into the multi-provider query; like the dicts
+# above, a miss rejects unknown column names with a KeyError.
+_SYNC_FLAG_SQL = {column: column for column in _SYNC_COLUMNS}
+_SYNC_PENDING_SQL = {column: "%s = 0" % column
+                     for column in _SYNC_COLUMNS}
+
+
+class SeriesDatabase:
+    """State store shared with the shell monitors.
+
+    One connection lives for the life of the instance; a lock
+    serializes access so thread-pooled callers can share it.
+    """
+
+    def __init__(self, db_path=None):
+        if db_path is None:
+            db_path = default_db_path()
+        self.db_path = db_path
+        # A missing file invalidates whatever schema knowledge was
+        # cached for this path; decide before connect(), which
+        # creates the file as a side effect.
+        if not os.path.exists(db_path):
+            _SCHEMA_READY.discard(db_path)
+        # The SQL here is all module-level constants with ?
+        # placeholders, so a wider statement cache (default 128)
+        # keeps every hot query prepared across the whole run.
+        self._conn = sqlite3.connect(db_path, timeout=30,
+                                     check_same_thread=False,
+                                     cached_statements=256)
+        self._conn.row_factory = sqlite3.Row
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        # WAL survives losing the last few commits on power cut, so
+        # NORMAL's fsync-per-checkpoint (not per-commit) is safe here.
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute("PRAGMA temp_store=MEMORY")
+        # Keep ~64MB of pages hot; the default 2MB evicts the indexes.
+        self._conn.execute("PRAGMA cache_size=-65536")
+        # RLock so writer methods still work inside transaction().
+        self._lock = threading.RLock()
+        self._in_txn = False
+        self._ensure_schema()
+
+    @classmethod
+    def open_readonly(cls, db_path=None):
+        """Open for queries only: no WAL setup, no DDL, no write lock.
+
+        Falls back to a normal (writable) open when the file does not
+        exist yet, since read-only mode cannot create it.
+        """
+        if db_path is None:
+            db_path = default_db_path()
+        if not os.path.exists(db_path):
+            return cls(db_path)
+        self = cls.__new__(cls)
+        self.db_path = db_path
+        self._conn = sqlite3.connect("file:%s?mode=ro" % db_path,
+                                     timeout=30, uri=True,
+                                     check_same_thread=False,
+                                     cached_statements=256)
+        self._conn.row_factory = sqlite3.Row
+        self._lock = threading.RLock()
+        self._in_txn = False
+        return self
+
+    def close(self):
+        if self._conn is not None:
+            self._conn.close()
+            self._conn = None
+
+    def __del__(self):
+        try:
+            self.close()
+        except Exception:
+            pass
+
+    @contextlib.contextmanager
+    def transaction(self):
+        """Group several writes under one lock and one commit.
+
+        Callers doing update+insert patterns per series get one WAL
+        fsync for the whole block instead of one per statement.
+        """
+        with self._lock:
+            self._in_txn = True
+            try:
+                with self._conn:
+                    yield self._conn
+            finally:
+                self._in_txn = False
+
+    @contextlib.contextmanager
+    def _write(self):
+        """One writer statement: its own commit unless in transaction()."""
+        with self._lock:
+            if self._in_txn:
+                yield self._conn
+            else:
+                with self._conn:
+                    yield self._conn
+
+    def _ensure_schema(self):
+        if self.db_path in _SCHEMA_READY:
+            return
+        with self._lock:
+            self._conn.executescript(_SCHEMA_DDL)
+        _SCHEMA_READY.add(self.db_path)
+
+    def series_exists(self, pw_instance, series_id):
+        """Whether a series has been recorded, like series_id_exists."""
+        with self._lock:
+            row = self._conn.execute(
+                _SQL_SERIES_EXISTS, (series_id, pw_instance)).fetchone()
+        return bool(row[0])
+
+    def add_series(self, pw_instance, pw_project, series_id, url,
+                   submitter, email):
+        """Record a newly seen series, like series_db_add_false."""
+        with self._write():
+            self._conn.execute(
+                _SQL_INSERT_SERIES,
+                (series_id, pw_project, url, submitter, email,
+                 pw_instance))
+
+    def add_series_many(self, rows):
+        """Record a batch of series in one parse and one commit.
+
+        Each row is the add_series argument tuple: (pw_instance,
+        pw_project, series_id, url, submitter, email).
+        """
+        if not rows:
+            return
+        params = [(series_id, pw_project, url, submitter, email,
+                   pw_instance)
+                  for pw_instance, pw_project, series_id, url,
+                  submitter, email in rows]
+        with self._write():
+            self._conn.executemany(_SQL_INSERT_SERIES, params)
+
+    def get_unsubmitted_series(self, pw_instance):
+        """Series not yet pushed for builds, streamed row by row."""
+        with self._lock:
+            yield from self._conn.execute(_SQL_UNSUBMITTED_SERIES,
+                                          (pw_instance,))
+
+    def set_series_submitted(self, pw_instance, series_id):
+        with self._write():
+            self._conn.execute(_SQL_SET_SUBMITTED,
+                               (series_id, pw_instance))
+
+    def get_uncompleted_series(self, pw_instance):
+        """Series still waiting for all their patches, streamed."""
+        with self._lock:
+            yield from self._conn.execute(_SQL_UNCOMPLETED_SERIES,
+                                          (pw_instance,))
+
+    def set_series_completed(self, pw_instance, series_id):
+        with self._write():
+            self._conn.execute(_SQL_SET_COMPLETED,
+                               (series_id, pw_instance))
+
+    def get_patch_id_by_series_and_sha(self, pw_instance, series_id, sha):
+        """Map a build sha back to its patch id."""
+        with self._lock:
+            row = self._conn.execute(
+                _SQL_PATCH_ID_BY_SHA,
+                (pw_instance, series_id, sha)).fetchone()
+        return row["patch_id"] if row else None
+
+    def recheck_request_exists(self, pw_instance, message_id, patch_id):
+        with self._lock:
+            row = self._conn.execute(
+                _SQL_RECHECK_EXISTS,
+                (pw_instance, message_id, patch_id)).fetchone()
+        return row is not None
+
+    def add_recheck_request(self, pw_instance, pw_project, message_id,
+                            requested_by, series_id, patch_id, label):
+        with self._write():
+            self._conn.execute(
+                _SQL_INSERT_RECHECK,
+                (0, message_id, requested_by, str(series_id), patch_id,
+                 pw_instance, pw_project))
+
+    def add_build(self, series_id, patch_id, patch_url, patch_name, sha,
+                  pw_instance, pw_project, repo_name):
+        """Record a build for later syncing, like insert_commit."""
+        with self._write():
+            self._conn.execute(
+                _SQL_INSERT_BUILD,
+                (series_id, patch_id, patch_url, patch_name, sha,
+                 pw_instance, pw_project, repo_name))
+
+    def insert_builds(self, rows):
+        """Record a batch of builds in one parse and one commit.
+
+        Each row is the add_build argument tuple; a series with many
+        patches lands as a single transaction.
+        """
+        if not rows:
+            return
+        with self._write():
+            self._conn.executemany(_SQL_INSERT_BUILD, rows)
+
+    def get_unsynced_builds(self, pw_instance, sync_column):
+        """Builds not yet reported for a CI, like get_unsynced_series.
+
+        Rows stream straight off the cursor; a large backlog never
+        materializes as one Python list.  Callers that write the
+        scanned columns mid-iteration must listify first — the same
+        connection gives the cursor no isolation from those updates.
+        """
+        with self._lock:
+            yield from self._conn.execute(_UNSYNCED_SQL[sync_column],
+                                          (pw_instance,))
+
+    def get_all_unsynced_builds_for_providers(self, pw_instance,
+                                              sync_columns):
+        """Builds any of several CIs still needs, in one query."""
+        flags = ", ".join(_SYNC_FLAG_SQL[column]
+                          for column in sync_columns)
+        where = " OR ".join(_SYNC_PENDING_SQL[column]
+                            for column in sync_columns)
+        with self._lock:
+            return self._conn.execute(
+                f"SELECT series_id, patch_id, patch_url, patch_name, "
+                f"sha, patchwork_project, repo_name, {flags} "
+                f"FROM git_builds WHERE patchwork_instance = ? "
+                f"AND ({where}) ORDER BY series_id",
+                (pw_instance,)).fetchall()
+
+    def set_build_synced(self, pw_instance, patch_id, sync_column):
+        """Mark one build reported, like set_synced_patch."""
+        with self._write():
+            self._conn.execute(_SET_SYNCED_SQL[sync_column],
+                               (pw_instance, patch_id))
+
+    def set_builds_synced(self, pw_instance, patch_ids, sync_column):
+        """Mark a batch of builds reported in one statement."""
+        if not patch_ids:
+            return
+        placeholders = ", ".join("?" for _ in patch_ids)
+        with self._write():
+            self._conn.execute(
+                _SET_SYNCED_BATCH_SQL[sync_column] % placeholders,
+                (pw_instance, *patch_ids))
+
+    def set_series_synced(self, pw_instance, series_id):
+        """Mark every build of a series reported for every CI."""
+        with self._write():
+            self._conn.execute(_SQL_SET_SERIES_SYNCED,
+                               (pw_instance, series_id))
+
+    def get_cached_patch_info(self, pw_instance, series_id, patch_id):
+        """Patch fields already on disk, shaped like a patch object.
+
+        One indexed lookup can stand in for the series+patch fetches
+        when the caller only needs url/name/submitter; msgid is not
+        stored, so callers needing reply threading must still fetch.
+        """
+        with self._lock:
+            row = self._conn.execute(
+                _SQL_CACHED_PATCH_INFO,
+                (pw_instance, series_id, patch_id)).fetchone()
+        if row is None:
+            return None
+        return {
+            "id": row["patch_id"],
+            "url": row["patch_url"],
+            "name": row["patch_name"],
+            "submitter": {"name": row["series_submitter"],
+                          "email": row["series_email"]},
+        }
+
+    def get_last_check(self, pw_instance, pw_project):
+        """When the monitor last completed a pass, or None."""
+        with self._lock:
+            row = self._conn.execute(
+                _SQL_GET_LAST_CHECK,
+                (pw_instance, pw_project)).fetchone()
+        if row is None:
+            return None
+        return datetime.fromisoformat(row["last_check_ts"])
+
+    def set_last_check(self, pw_instance, pw_project, timestamp):
+        """Record a completed monitor pass."""
+        with self._write():
+            self._conn.execute(
+                _SQL_SET_LAST_CHECK,
+                (pw_instance, pw_project, timestamp.isoformat()))
+
+    def get_active_branches(self, pw_instance):
+        """Branches awaiting results, streamed like the other scans."""
+        with self._lock:
+            yield from self._conn.execute(_SQL_ACTIVE_BRANCHES,
+                                          (pw_instance,))
+
+    def activate_branch(self, pw_instance, series_id, repo, branch):
+        """Tie a series to a pushed branch, like series_activate_branch."""
+        with self._write():
+            self._conn.execute(_SQL_ACTIVATE_BRANCH,
+                               (branch, repo, series_id, pw_instance))
+
+    def clear_branch(self, pw_instance, series_id):
+        """Forget a series branch, like series_clear_branch."""
+        with self._write():
+            self._conn.execute(_SQL_CLEAR_BRANCH,
+                               (series_id, pw_instance))
@@ -0,0 +1,198 @@
+# SPDX-Identifier: gpl-2.0-or-later
+# Copyright (C) 2026, Red Hat, Inc.
+#
+# Licensed under the terms of the GNU General Public License as published
+# by the Free Software Foundation; either version 2 of the License, or
+# (at your option) any later version.  You may obtain a copy of the
+# license at
+#
+#    https://www.gnu.org/licenses/old-licenses/gpl-2.0.html
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# License for the specific language governing permissions and limitations
+# under the License.
+
+"""Report email generation and delivery, matching ci_mon's report.eml."""
+
+import dataclasses
+import os
+import smtplib
+import subprocess
+import tempfile
+from datetime import datetime
+from email.mime.text import MIMEText
+
+from jinja2 import Template
+
+# The report.eml body ci_mon generated; headers are set on the MIME
+# message directly so the send path never has to re-parse them.
+_REPORT_TEMPLATE_SRC = """\
+Test-Label: {{ test_label }}
+Test-Status: {{ label }}
+{{ patch_url }}
+
+_build: {{ result }}_
+Build URL: {{ build_url }}{% if log_output %}
+{{ log_output }}{% endif %}"""
+
+_POST_RESULT_TEMPLATE_SRC = """\
+Test-Label: ci-robot-post
+Test-Status: {{ label }}
+Report URL: {{ report_url }}"""
+
+
+@dataclasses.dataclass
+class ReportEmail:
+    """A generated report, ready to hand to any send path."""
+
+    message: MIMEText
+    cc: str = None
+
+    def recipients(self):
+        to_addrs = [self.message["To"]]
+        if self.cc:
+            to_addrs.append(self.cc)
+        return to_addrs
+
+    def to_string(self):
+        return self.message.as_string()
+
+
+class EmailReporter:
+    """Build and send the test report emails ci_mon used to emit."""
+
+    def __init__(self, to_addr, from_addr, smtp_server="localhost",
+                 smtp_port=25, dry_run=False, report_success="SUCCESS",
+                 report_failure="FAILURE", report_warning="WARNING"):
+        self.to_addr = to_addr
+        self.from_addr = from_addr
+        self.smtp_server = smtp_server
+        self.smtp_port = smtp_port
+        self.dry_run = dry_run
+        self.report_success = report_success
+        self.report_failure = report_failure
+        self.report_warning = report_warning
+        # Compiled once; render() per email beats re-joining strings.
+        self._report_tpl = Template(_REPORT_TEMPLATE_SRC)
+        self._post_tpl = Template(_POST_RESULT_TEMPLATE_SRC)
+        self._batch_date = None
+        self._queue = []
+
+    def set_batch_date(self):
+        """Stamp one Date header for every email in the coming batch.
+
+        strftime is microseconds of work; a monitor pass generating
+        many reports only needs it once.
+        """
+        self._batch_date = datetime.now().strftime("%a, %e %b %Y %T %z")
+
+    def result_label(self, result):
+        if result == "passed":
+            return self.report_success
+        if result == "failed":
+            return self.report_failure
+        return self.report_warning
+
+    def generate_report_email(self, build_result, patch_data, patch_url,
+                              test_label, log_output=""):
+        """Assemble the report.eml message for one build result."""
+        label = self.result_label(build_result.result)
+        submitter_email = (patch_data.get("submitter") or {}).get("email", "")
+        cc = None
+        if build_result.result != "passed" and submitter_email:
+            cc = submitter_email
+        body = self._report_tpl.render(
+            label=label, test_label=test_label, patch_url=patch_url,
+            result=build_result.result, build_url=build_result.build_url,
+            log_output=log_output)
+        message = self._make_message(
+            body, cc, "|%s| pw%s %s" % (label, build_result.patch_id,
+                                        build_result.patch_name),
+            patch_data.get("msgid", ""))
+        return ReportEmail(message=message, cc=cc)
+
+    def generate_post_result_email(self, build_result, patch_data,
+                                   report_url):
+        """Assemble the follow-up email pointing at a posted report."""
+        body = self._post_tpl.render(label=self.report_success,
+                                     report_url=report_url)
+        message = self._make_message(
+            body, None,
+            "|%s| pw%s %s" % (self.report_success, build_result.patch_id,
+                              build_result.patch_name),
+            patch_data.get("msgid", ""))
+        return ReportEmail(message=message)
+
+    def _make_message(self, body, cc, subject, msgid):
+        """Set the report.eml headers on a fresh MIME message."""
+        message = MIMEText(body)
+        message["To"] = self.to_addr
+        message["From"] = self.from_addr
+        if cc:
+            message["Cc"] = cc
+        message["Subject"] = subject
+        message["Date"] = (self._batch_date
+                           or datetime.now().strftime("%a, %e %b %Y %T %z"))
+        message["In-Reply-To"] = msgid
+        message["References"] = msgid
+        return message
+
+    def queue_email(self, report):
+        """Hold a report for the next flush().
+
+        list.append is atomic, so thread-pooled producers can queue
+        without coordination.
+        """
+        self._queue.append(report)
+
+    def flush(self):
+        """Send every queued report over one SMTP connection."""
+        queue, self._queue = self._queue, []
+        self.send_smtp_batch(queue)
+
+    def send_smtp_email(self, report):
+        """Send one generated report over SMTP."""
+        self.send_smtp_batch([report])
+
+    def send_smtp_batch(self, reports):
+        """Send several ReportEmails over one SMTP connection."""
+        if not reports:
+            return
+        if self.dry_run:
+            for report in reports:
+                print(report.to_string())
+            return
+        server = smtplib.SMTP(self.smtp_server, self.smtp_port)
+        try:
+            for report in reports:
+                server.send_message(report.message,
+                                    from_addr=self.from_addr,
+                                    to_addrs=report.recipients())
+        finally:
+            server.quit()
+
+    def send_email_via_git(self, report):
+        """Send a generated report, historically via git send-email.
+
+        The subprocess path (temp file, fork, perl startup, TLS setup
+        per message) only survives for dry runs, where showing the
+        git command is still useful; real sends go over SMTP.
+        """
+        if not self.dry_run:
+            self.send_smtp_email(report)
+            return
+        fd, path = tempfile.mkstemp(suffix=".eml", prefix="pwci-")
+        try:
+            with os.fdopen(fd, "w") as handle:
+                handle.write(report.to_string())
+            command = ["git", "send-email", "--suppress-from",
+                       "--to=%s" % self.to_addr]
+            if report.cc:
+                command.append("--cc=%s" % report.cc)
+            command.append("--dry-run")
+            command.append(path)
+            subprocess.run(command, check=False)
+        finally:
+            os.unlink(path)
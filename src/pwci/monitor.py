@@ -0,0 +1,297 @@
+# SPDX-Identifier: gpl-2.0-or-later
+# Copyright (C) 2026, Red Hat, Inc.
+#
+# Licensed under the terms of the GNU General Public License as published
+# by the Free Software Foundation; either version 2 of the License, or
+# (at your option) any later version.  You may obtain a copy of the
+# license at
+#
+#    https://www.gnu.org/licenses/old-licenses/gpl-2.0.html
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# License for the specific language governing permissions and limitations
+# under the License.
+
+"""CI result reporting loop, ported from ci_mon."""
+
+import re
+import subprocess
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from pwci import post_result as post_result_mod
+from pwci._json import loads as _loads
+from pwci.ci_providers import create_provider_bundle
+
+# URL filter modes, decided once in set_url_filter so the per-result
+# apply is a single attribute test.
+FILTER_NONE = 0
+FILTER_REGEX = 1
+
+
+class CIMonitor:
+    """Collect provider build results and report them, like ci_mon."""
+
+    def __init__(self, db, providers, email_reporter, patchwork_client,
+                 url_filter=None, post_result=False, post_result_extra=None,
+                 post_result_script=False, dry_run=False):
+        self.db = db
+        self.providers = providers
+        self.email_reporter = email_reporter
+        self.patchwork_client = patchwork_client
+        self.set_url_filter(url_filter)
+        self.post_result = post_result
+        self.post_result_extra = post_result_extra or []
+        self.post_result_script = post_result_script
+        self.dry_run = dry_run
+        # Build results often share a series; fetch each one once per
+        # provider scan instead of once per result.
+        self.cache_ttl = 60
+        self.process_workers = 8
+        self._series_cache = {}
+        self._patch_cache = {}
+        self._log_outputs = {}
+        self._cache_lock = threading.Lock()
+
+    def _log(self, message):
+        print(message, file=sys.stderr)
+
+    def get_series_data(self, series_id, pw_instance=""):
+        """Fetch the series object for a build result, cached with a TTL."""
+        key = (pw_instance, series_id)
+        now = time.monotonic()
+        with self._cache_lock:
+            cached = self._series_cache.get(key)
+            if cached is not None and now - cached[0] < self.cache_ttl:
+                return cached[1]
+        series = self.patchwork_client.get_series(series_id)
+        with self._cache_lock:
+            self._series_cache[key] = (now, series)
+        return series
+
+    def _get_patch(self, patch_url):
+        """Fetch one patch object, cached for the current scan."""
+        with self._cache_lock:
+            patch = self._patch_cache.get(patch_url)
+        if patch is None:
+            patch = self.patchwork_client.get_patch(patch_url)
+            with self._cache_lock:
+                self._patch_cache[patch_url] = patch
+        return patch
+
+    # Everything the report path reads from a patch; when the series
+    # payload already embeds these, the second GET is redundant.
+    _EMBEDDED_PATCH_FIELDS = ("id", "url", "msgid", "submitter")
+
+    def _resolve_patch(self, patch):
+        if all(field in patch for field in self._EMBEDDED_PATCH_FIELDS):
+            return patch
+        return self._get_patch(patch["url"])
+
+    def _patch_from_db(self, build_result):
+        """Resolve the patch from the local DB when possible.
+
+        A row in git_builds already names the patch URL, so a hit
+        skips the series fetch outright; when the row carries every
+        reported field it skips the patch fetch too.
+        """
+        cached = self.db.get_cached_patch_info(build_result.pw_instance,
+                                               build_result.series_id,
+                                               build_result.patch_id)
+        if not cached:
+            return None
+        if all(field in cached for field in self._EMBEDDED_PATCH_FIELDS):
+            return cached
+        if cached.get("url"):
+            return self._get_patch(cached["url"])
+        return None
+
+    def get_patch_data(self, series_data, patch_id):
+        """The patch object a report should reply to, embedded or
+        fetched."""
+        patches = series_data.get("patches") or []
+        if patch_id:
+            for patch in patches:
+                if patch["id"] == patch_id:
+                    return self._resolve_patch(patch)
+        if not patches:
+            return {}
+        return self._resolve_patch(patches[-1])
+
+    def set_url_filter(self, url_filter):
+        """Parse the sed-style s/pat/rep/ transform once up front."""
+        self.url_filter = url_filter
+        self._filter_mode = FILTER_NONE
+        self._compiled_url_filter = None
+        if not url_filter or url_filter == "q":
+            return
+        if url_filter.startswith("s") and url_filter.count("/") >= 3:
+            _, pattern, replacement, _ = url_filter.split("/", 3)
+            self._compiled_url_filter = (re.compile(pattern), replacement)
+            self._filter_mode = FILTER_REGEX
+
+    def apply_patch_url_filter(self, patch_url):
+        """Apply the precompiled URL transform to a patch URL."""
+        if self._filter_mode == FILTER_NONE:
+            return patch_url
+        pattern, replacement = self._compiled_url_filter
+        return pattern.sub(replacement, patch_url)
+
+    def get_log_output(self, provider, build_result):
+        """Fetch build logs, in-process when the provider can."""
+        logs = provider.get_logs(build_result)
+        if logs is not None:
+            return logs
+        script = "./%s_get_logs.sh" % provider.test_label
+        try:
+            result = subprocess.run(
+                [script, build_result.repo_name,
+                 str(build_result.series_id), build_result.sha,
+                 provider.token or "", build_result.test_name or ""],
+                capture_output=True, text=True, timeout=60)
+        except (OSError, subprocess.TimeoutExpired):
+            return ""
+        return result.stdout
+
+    def run_post_result_submit(self, provider, build_result, patch_id):
+        """Post the result as a Patchwork check.
+
+        Runs in-process through pwci.post_result unless the
+        compatibility script path was requested, which forks the old
+        ./{ci}_post_result_submit per result.
+        """
+        if not self.post_result_script:
+            return post_result_mod.submit(
+                self.patchwork_client, provider.test_label, build_result,
+                patch_id, dry_run=self.dry_run)
+        script = "./%s_post_result_submit" % provider.test_label
+        command = [script,
+                   "--result=%s" % build_result.result,
+                   "--series-id=%s" % build_result.series_id,
+                   "--patch-id=%s" % patch_id,
+                   "--pw-instance=%s" % build_result.pw_instance,
+                   "--ci-type=%s" % provider.test_label]
+        if self.dry_run:
+            command.append("--dry-run")
+        command.extend(self.post_result_extra)
+        try:
+            result = subprocess.run(command, capture_output=True,
+                                    text=True, timeout=60)
+        except (OSError, subprocess.TimeoutExpired):
+            return {}
+        try:
+            return _loads(result.stdout)
+        except ValueError:
+            return {}
+
+    def process_build_result(self, provider, build_result):
+        """Report one completed build: email, then optional post."""
+        patch_data = self._patch_from_db(build_result)
+        if not patch_data:
+            series_data = self.get_series_data(build_result.series_id,
+                                               build_result.pw_instance)
+            patch_data = self.get_patch_data(series_data,
+                                             build_result.patch_id)
+        if not patch_data:
+            self._log("no patch data for series %s"
+                      % build_result.series_id)
+            return
+
+        patch_url = self.apply_patch_url_filter(patch_data.get("url", ""))
+        if build_result.test_name:
+            test_label = "%s-robot: %s" % (provider.test_label,
+                                           build_result.test_name)
+        else:
+            test_label = "%s-robot" % provider.test_label
+
+        log_output = self._log_outputs.get(
+            (build_result.series_id, build_result.sha))
+        if log_output is None:
+            log_output = self.get_log_output(provider, build_result)
+        report = self.email_reporter.generate_report_email(
+            build_result, patch_data, patch_url, test_label, log_output)
+        self.email_reporter.queue_email(report)
+
+        if not self.post_result:
+            return
+        output = self.run_post_result_submit(provider, build_result,
+                                             patch_data.get("id"))
+        report_url = output.get("url")
+        if report_url:
+            self._log("(Post report URL: %s)" % report_url)
+            report = self.email_reporter.generate_post_result_email(
+                build_result, patch_data, output.get("html_url",
+                                                     report_url))
+            self.email_reporter.queue_email(report)
+
+    def monitor_ci_systems(self):
+        """One reporting pass over every configured provider."""
+        self.email_reporter.set_batch_date()
+        shared = self._shared_unsynced_builds()
+        # One background thread walks the providers ahead of the
+        # loop, so provider N+1's build results are already being
+        # fetched while provider N's batch is reported.
+        with ThreadPoolExecutor(max_workers=1) as prefetcher:
+            fetches = [
+                (provider,
+                 prefetcher.submit(self._fetch_results, provider,
+                                   shared))
+                for provider in self.providers]
+            for provider, fetch in fetches:
+                self._scan_provider(provider, fetch.result())
+
+    def _shared_unsynced_builds(self):
+        """One git_builds scan fanned out to the sync-column providers.
+
+        Replaces the near-identical table scan each provider would
+        otherwise run itself; rows are grouped per provider for
+        _fetch_results to hand to get_build_results.
+        """
+        shared = {}
+        for pw_instance in {provider.pw_instance
+                            for provider in self.providers}:
+            group = [provider for provider in self.providers
+                     if provider.pw_instance == pw_instance]
+            for provider, build in create_provider_bundle(
+                    pw_instance, group, self.db):
+                shared.setdefault(provider, []).append(build)
+        return shared
+
+    def _fetch_results(self, provider, shared):
+        """Materialize one provider's results from its shared rows."""
+        if provider.sync_column:
+            return list(provider.get_build_results(
+                builds=shared.get(provider, [])))
+        return list(provider.get_build_results())
+
+    def _scan_provider(self, provider, build_results):
+        """Report one provider's prefetched batch of build results."""
+        self._log("Scanning %s" % provider.test_label)
+        self._series_cache.clear()
+        self._patch_cache.clear()
+        if not build_results:
+            return
+        # Logs dominate a result's wall time; fetch them all up
+        # front so the report loop below never waits on one.
+        with ThreadPoolExecutor(
+                max_workers=self.process_workers) as executor:
+            self._log_outputs = dict(zip(
+                ((result.series_id, result.sha)
+                 for result in build_results),
+                executor.map(
+                    lambda result: self.get_log_output(provider, result),
+                    build_results)))
+        # Each result still blocks on its series/patch GETs;
+        # they are independent, so overlap them.
+        with ThreadPoolExecutor(
+                max_workers=self.process_workers) as executor:
+            list(executor.map(
+                lambda result: self.process_build_result(provider,
+                                                         result),
+                build_results))
+        # One SMTP connection delivers the whole provider batch.
+        self.email_reporter.flush()
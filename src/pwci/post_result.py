@@ -0,0 +1,60 @@
+# SPDX-Identifier: gpl-2.0-or-later
+# Copyright (C) 2026, Red Hat, Inc.
+#
+# Licensed under the terms of the GNU General Public License as published
+# by the Free Software Foundation; either version 2 of the License, or
+# (at your option) any later version.  You may obtain a copy of the
+# license at
+#
+#    https://www.gnu.org/licenses/old-licenses/gpl-2.0.html
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# License for the specific language governing permissions and limitations
+# under the License.
+
+"""Post build results as Patchwork checks, like post_pw.sh.
+
+The shell scripts spawned one interpreter per result; submit() runs
+in-process and reuses the client's warm pooled session.
+"""
+
+from urllib.parse import urljoin
+
+from pwci._json import loads as _loads
+
+# BuildResult results mapped onto the Patchwork check states.
+RESULT_TO_CHECK_STATE = {
+    "passed": "success",
+    "failed": "fail",
+    "warning": "warning",
+}
+
+
+def submit(client, provider_name, build_result, patch_id, dry_run=False):
+    """Post one check for a build result; returns the check object.
+
+    Mirrors what ./{ci}_post_result_submit printed: a dict carrying
+    at least url/html_url on success, or {} on failure.
+    """
+    state = RESULT_TO_CHECK_STATE.get(build_result.result, "warning")
+    payload = {
+        "state": state,
+        "target_url": build_result.build_url,
+        "context": "%s-robot" % provider_name,
+        "description": "_build: %s_" % build_result.result,
+    }
+    endpoint = urljoin(client.base_url + "/",
+                       "api/patches/%s/checks/" % patch_id)
+    if dry_run:
+        return {"url": endpoint, "html_url": endpoint, "dry_run": True}
+    try:
+        response = client.session.post(endpoint, json=payload)
+        response.raise_for_status()
+    except Exception:
+        return {}
+    try:
+        return _loads(response.content)
+    except ValueError:
+        return {}
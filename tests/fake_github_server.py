@@ -0,0 +1,519 @@
+#!/usr/bin/env python3
+# SPDX-Identifier: gpl-2.0-or-later
+# Copyright (C) 2026, Red Hat, Inc.
+#
+# Fake GitHub REST API server for exercising the pw-ci monitors.
+#
+# Licensed under the terms of the GNU General Public License as published
+# by the Free Software Foundation; either version 2 of the License, or
+# (at your option) any later version.  You may obtain a copy of the
+# license at
+#
+#    https://www.gnu.org/licenses/old-licenses/gpl-2.0.html
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# License for the specific language governing permissions and limitations
+# under the License.
+
+"""Serves just enough of the GitHub Actions REST API for github_mon and
+friends to poll localhost instead of api.github.com.  Endpoints:
+
+   /repos/{owner}/{repo}
+   /repos/{owner}/{repo}/actions/runs?branch=...&per_page=...
+   /repos/{owner}/{repo}/actions/runs/{run_id}
+   /repos/{owner}/{repo}/actions/runs/{run_id}/jobs
+   /repos/{owner}/{repo}/actions/jobs/{job_id}
+
+Unknown repositories and run ids are fabricated on demand so tests do
+not need to seed the server.
+"""
+
+import functools
+import itertools
+import os
+import random
+import re
+import sys
+import time
+import zlib
+from datetime import datetime, timedelta
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlparse
+
+import orjson
+
+GITHUB_API = "https://api.github.com"
+LISTEN_PORT = 8001
+
+# GitHub's real API returns compact JSON; pretty-printing costs about
+# a third extra in serialization and bytes moved, so only indent when
+# someone is eyeballing responses.
+_DUMPS_OPTS = (orjson.OPT_INDENT_2
+               if os.environ.get("PWCI_FAKE_SERVER_DEBUG") else 0)
+
+WORKFLOW_NAMES = [
+    "Build and Test",
+    "Static Analysis",
+    "Documentation",
+    "Linux Build",
+    "Windows Build",
+    "MacOS Build",
+    "Coverage",
+    "Style Check",
+]
+
+STATUSES = ["completed", "in_progress", "queued"]
+
+CONCLUSIONS = ["success", "failure", "neutral", "cancelled", "skipped",
+               "timed_out"]
+
+# Jobs only ever conclude success/failure/neutral; slicing CONCLUSIONS
+# per call allocated a fresh list every time.
+JOB_CONCLUSIONS = tuple(CONCLUSIONS[:3])
+
+WORKFLOW_PATH_SLUGS = {name: name.lower().replace(" ", "_")
+                       for name in WORKFLOW_NAMES}
+
+# Literals repeated in every stored run; interning keeps one PyObject
+# per value no matter how many runs accumulate in WORKFLOW_RUNS.
+_BOT_LOGIN = sys.intern("github-actions[bot]")
+_BOT_TYPE = sys.intern("Bot")
+_USER_TYPE = sys.intern("User")
+_EVENT_PUSH = sys.intern("push")
+
+# Author and committer are always the same identity; share one dict
+# by reference instead of building two per run.
+_TEST_USER = {"name": "Test Author", "email": "test-author@example.com"}
+
+
+def _make_repository(repo_id, full_name, description):
+    owner, _, name = full_name.partition("/")
+    return {
+        "id": repo_id,
+        "node_id": "R_%d" % repo_id,
+        "name": name,
+        "full_name": full_name,
+        "private": False,
+        "owner": {"login": owner, "id": repo_id * 100,
+                  "type": "Organization"},
+        "html_url": f"https://github.com/{full_name}",
+        "description": description,
+        "fork": False,
+        "url": f"{GITHUB_API}/repos/{full_name}",
+        "default_branch": "main",
+    }
+
+
+REPOSITORIES = {
+    "owner/repo": _make_repository(1296269, "owner/repo",
+                                   "Test repository"),
+    "dpdk/dpdk": _make_repository(3638964, "dpdk/dpdk",
+                                  "Data Plane Development Kit"),
+    "openvswitch/ovs": _make_repository(2935638, "openvswitch/ovs",
+                                        "Open vSwitch"),
+}
+
+# Serialized repository responses, ready to write.  The known repos
+# are serialized at import; unknown ones are fabricated and cached on
+# first request, so every repository hit after the first is a dict
+# lookup plus one socket write.
+_REPO_BYTES = {name: orjson.dumps(repo, option=_DUMPS_OPTS)
+               for name, repo in REPOSITORIES.items()}
+
+# run_id -> workflow run object, populated at startup and extended on
+# demand when a request names a run we have not seen yet.
+WORKFLOW_RUNS = {}
+
+# Pre-serialized bytes for workflow runs, keyed by run id.  The hot
+# path writes these directly instead of re-serializing the same
+# object on every poll.
+_SERIALIZED = {}
+
+# Weak ETags derived from the serialized run bytes, so they change
+# whenever _store_run refreshes a mutated run.
+_ETAGS = {}
+
+_RUN_IDS = itertools.count(6000000000)
+
+# Routing patterns, tried in order by do_GET.  A single C-level match
+# replaces the old startswith/strip/split chain and hands each handler
+# its path components pre-parsed.
+_RUNS_RE = re.compile(
+    r"^/repos/(?P<owner>[^/]+)/(?P<repo>[^/]+)/actions/runs"
+    r"(?:/(?P<run_id>\d+)(?P<jobs>/jobs)?)?$")
+_JOBS_RE = re.compile(
+    r"^/repos/(?P<owner>[^/]+)/(?P<repo>[^/]+)/actions/jobs/(?P<job_id>\d+)$")
+_REPO_RE = re.compile(r"^/repos/(?P<owner>[^/]+)/(?P<repo>[^/]+)$")
+
+
+def _rng(run_id, repo_name):
+    """Private random.Random seeded from the request identity.
+
+    A fresh instance avoids the module RNG's global lock, and the
+    deterministic seed makes generated fixtures reproducible: the same
+    (run_id, repo_name) always yields the same run and jobs.  crc32 is
+    used instead of hash(), which is salted per process.
+    """
+    return random.Random((run_id << 16)
+                         ^ zlib.crc32(repo_name.encode("utf-8")))
+
+
+# X-RateLimit-Reset only needs one-second resolution, so recompute it
+# at most once a second rather than taking a clock_gettime per
+# response.
+_RL_RESET = [0, b"0"]
+
+
+def _rl_reset():
+    now = int(time.monotonic())
+    if now != _RL_RESET[0]:
+        _RL_RESET[0] = now
+        _RL_RESET[1] = str(int(time.time()) + 3600).encode("ascii")
+    return _RL_RESET[1]
+
+
+def _parse_query(query):
+    """Single-value query parser for the plain ASCII params used here.
+
+    parse_qs builds a dict of lists and runs unquote on every piece;
+    the only parameters this API takes (branch, per_page) never need
+    either.
+    """
+    out = {}
+    if query:
+        for kv in query.split("&"):
+            key, _, value = kv.partition("=")
+            if key:
+                out[key] = value
+    return out
+
+
+_STATUS_LINES = {
+    200: b"HTTP/1.1 200 OK",
+    304: b"HTTP/1.1 304 Not Modified",
+    404: b"HTTP/1.1 404 Not Found",
+}
+
+
+def _store_run(run_id, run):
+    """Record a workflow run and its serialized form.
+
+    Call this again after mutating a run to refresh the cached bytes.
+    """
+    WORKFLOW_RUNS[run_id] = run
+    blob = _SERIALIZED[run_id] = orjson.dumps(run, option=_DUMPS_OPTS)
+    _ETAGS[run_id] = 'W/"%x"' % zlib.crc32(blob)
+    return run
+
+
+@functools.lru_cache(maxsize=128)
+def _repo_urls(repo_name):
+    """URL prefixes shared by every run generated for a repository.
+
+    Caching these turns the dozen per-run f-string interpolations into
+    single concatenations of a prefix and the stringified id.
+    """
+    api = f"{GITHUB_API}/repos/{repo_name}"
+    return (api + "/actions/runs/",
+            f"https://github.com/{repo_name}/actions/runs/",
+            api + "/check-suites/",
+            api + "/actions/workflows/")
+
+
+def generate_workflow_run(run_id, repo_name, branch, sha=None):
+    """Build a plausible GitHub Actions workflow run object."""
+    rng = _rng(run_id, repo_name)
+    workflow_name = rng.choice(WORKFLOW_NAMES)
+    status = rng.choice(STATUSES)
+    conclusion = rng.choice(CONCLUSIONS) if status == "completed" else None
+    # One draw covers both 160-bit hashes.
+    bits = rng.getrandbits(320)
+    tree_sha = "%040x" % (bits & ((1 << 160) - 1))
+    if sha is None:
+        sha = "%040x" % (bits >> 160)
+    workflow_id = rng.randint(1000000, 9999999)
+    check_suite_id = rng.randint(10000000, 99999999)
+    # Format each timestamp exactly once; created_iso is shared by
+    # created_at and the head_commit timestamp.
+    created = (datetime.now().replace(microsecond=0)
+               - timedelta(minutes=rng.randint(5, 120)))
+    created_iso = created.isoformat() + "Z"
+    updated_iso = (created
+                   + timedelta(minutes=rng.randint(1, 30))).isoformat() + "Z"
+    started_iso = (created
+                   + timedelta(seconds=rng.randint(10, 90))).isoformat() + "Z"
+    api_runs, html_runs, check_suites, workflows = _repo_urls(repo_name)
+    rid = str(run_id)
+    # Only fabricate a repository object on a cache miss; the .get
+    # default form built (and threw away) one per call even for known
+    # repos.
+    repo_obj = REPOSITORIES.get(repo_name) or _make_repository(
+        1, repo_name, "")
+
+    return {
+        "id": run_id,
+        "name": workflow_name,
+        "node_id": "WFR_%d" % run_id,
+        "head_branch": branch,
+        "head_sha": sha,
+        "path": f".github/workflows/{WORKFLOW_PATH_SLUGS[workflow_name]}.yml",
+        "display_title": f"Apply {branch}",
+        "run_number": rng.randint(1, 500),
+        "event": _EVENT_PUSH,
+        "status": status,
+        "conclusion": conclusion,
+        "workflow_id": workflow_id,
+        "check_suite_id": check_suite_id,
+        "check_suite_node_id": "CS_%d" % check_suite_id,
+        "url": api_runs + rid,
+        "html_url": html_runs + rid,
+        "created_at": created_iso,
+        "updated_at": updated_iso,
+        "run_attempt": 1,
+        "run_started_at": started_iso,
+        "jobs_url": api_runs + rid + "/jobs",
+        "logs_url": api_runs + rid + "/logs",
+        "check_suite_url": check_suites + str(check_suite_id),
+        "artifacts_url": api_runs + rid + "/artifacts",
+        "cancel_url": api_runs + rid + "/cancel",
+        "rerun_url": api_runs + rid + "/rerun",
+        "previous_attempt_url": None,
+        "workflow_url": workflows + str(workflow_id),
+        "head_commit": {
+            "id": sha,
+            "tree_id": tree_sha,
+            "message": f"Apply {branch}",
+            "timestamp": created_iso,
+            "author": _TEST_USER,
+            "committer": _TEST_USER,
+        },
+        "repository": repo_obj,
+        "head_repository": repo_obj,
+        "actor": {"login": _BOT_LOGIN, "id": 41898282,
+                  "type": _BOT_TYPE},
+        "triggering_actor": {"login": "test-author",
+                             "id": rng.randint(1, 99999),
+                             "type": _USER_TYPE},
+    }
+
+
+# Constant parts of every generated job.  orjson only reads these, so
+# the jobs can share them instead of allocating fresh copies; the
+# varying fields are overlaid with a dict-unpack at build time.
+_STEP_CHECKOUT = {"name": "Checkout", "status": "completed",
+                  "conclusion": "success", "number": 1}
+_STEP_BUILD = {"name": "Build", "number": 2}
+_UBUNTU_LABELS = ("ubuntu-latest",)
+_RUNNER_GROUP = sys.intern("GitHub Actions")
+
+
+def generate_jobs_for_run(run_id, repo_name):
+    """Build the job list for a workflow run."""
+    rng = _rng(run_id * 31, repo_name)
+    num_jobs = rng.randint(1, 4)
+    # Draw everything the loop needs up front, one RNG entry per pool.
+    statuses = rng.choices(STATUSES, k=num_jobs)
+    conclusions = rng.choices(JOB_CONCLUSIONS, k=num_jobs)
+    start_mins = rng.choices(range(1, 61), k=num_jobs)
+    durations = rng.choices(range(1, 16), k=num_jobs)
+    runner_ids = rng.choices(range(1, 21), k=2 * num_jobs)
+    shas = rng.getrandbits(160 * num_jobs)
+    now = datetime.now().replace(microsecond=0)
+    jobs = []
+    for i in range(num_jobs):
+        job_id = run_id * 10 + i
+        status = statuses[i]
+        conclusion = conclusions[i] if status == "completed" else None
+        started = now - timedelta(minutes=start_mins[i])
+        started_iso = started.isoformat() + "Z"
+        completed_iso = (started
+                         + timedelta(minutes=durations[i])).isoformat() + "Z"
+        jobs.append({
+            "id": job_id,
+            "run_id": run_id,
+            "run_url": f"{GITHUB_API}/repos/{repo_name}/actions/runs/{run_id}",
+            "run_attempt": 1,
+            "node_id": "J_%d" % job_id,
+            "head_sha": "%040x" % ((shas >> (160 * i)) & ((1 << 160) - 1)),
+            "url": f"{GITHUB_API}/repos/{repo_name}/actions/jobs/{job_id}",
+            "html_url": f"https://github.com/{repo_name}/actions/runs/{run_id}/job/{job_id}",
+            "status": status,
+            "conclusion": conclusion,
+            "started_at": started_iso,
+            "completed_at": completed_iso,
+            "name": f"job-{i}",
+            "steps": [
+                {**_STEP_CHECKOUT,
+                 "started_at": started_iso,
+                 "completed_at": started_iso},
+                {**_STEP_BUILD,
+                 "status": status, "conclusion": conclusion,
+                 "started_at": started_iso,
+                 "completed_at": completed_iso},
+            ],
+            "check_run_url": f"{GITHUB_API}/repos/{repo_name}/check-runs/{job_id}",
+            "labels": _UBUNTU_LABELS,
+            "runner_id": runner_ids[2 * i],
+            "runner_name": f"GitHub Actions {runner_ids[2 * i + 1]}",
+            "runner_group_id": 2,
+            "runner_group_name": _RUNNER_GROUP,
+        })
+    return jobs
+
+
+# Generated job lists, keyed by (run_id, repo_name), plus a flat index
+# by job id.  Polling the same run must keep returning the same jobs
+# (the real API does), and the memo makes the repoll O(1) instead of a
+# fresh random rebuild plus linear scan.
+_JOBS_CACHE = {}
+_JOBS_BY_ID = {}
+
+
+def jobs_for_run(run_id, repo_name):
+    key = (run_id, repo_name)
+    jobs = _JOBS_CACHE.get(key)
+    if jobs is None:
+        jobs = _JOBS_CACHE[key] = generate_jobs_for_run(run_id, repo_name)
+        for job in jobs:
+            _JOBS_BY_ID[job["id"]] = job
+    return jobs
+
+
+class GitHubHandler(BaseHTTPRequestHandler):
+
+    # Buffer the response stream so the status line, headers and body
+    # leave in one write() instead of a syscall per piece; the base
+    # handler flushes on finish().
+    wbufsize = 64 * 1024
+
+    # HTTP/1.1 keeps the client's connection open between polls, so a
+    # monitor loop pays for one TCP handshake instead of one per
+    # request.  Nagle is disabled so the small buffered responses are
+    # not delayed waiting for more data.
+    protocol_version = "HTTP/1.1"
+    disable_nagle_algorithm = True
+
+    def send_json_response(self, data, status=200):
+        self.send_raw_json(orjson.dumps(data, option=_DUMPS_OPTS), status)
+
+    def send_raw_json(self, blob, status=200, etag=None):
+        """Write status line, headers and body as one buffer.
+
+        send_response/send_header pay a Python call (and potentially a
+        write) per header; assembling the whole response here keeps
+        the hot path to a single write on the buffered stream.
+        """
+        head = (_STATUS_LINES[status] +
+                b"\r\nContent-Type: application/json"
+                b"\r\nContent-Length: " + str(len(blob)).encode("ascii") +
+                b"\r\nAccess-Control-Allow-Origin: *"
+                b"\r\nX-RateLimit-Limit: 5000"
+                b"\r\nX-RateLimit-Remaining: 4999"
+                b"\r\nX-RateLimit-Reset: " + _rl_reset())
+        if etag is not None:
+            head += b"\r\nETag: " + etag.encode("ascii")
+        self.wfile.write(head + b"\r\n\r\n" + blob)
+
+    def send_not_modified(self, etag):
+        """304 fast path: no serialization, no body, headers only."""
+        self.wfile.write(_STATUS_LINES[304] +
+                         b"\r\nETag: " + etag.encode("ascii") +
+                         b"\r\n\r\n")
+
+    def do_GET(self):
+        parsed = urlparse(self.path)
+        path = parsed.path
+        query = _parse_query(parsed.query)
+
+        m = _RUNS_RE.match(path)
+        if m is not None:
+            self.handle_actions_runs(m, query)
+            return
+        m = _JOBS_RE.match(path)
+        if m is not None:
+            self.handle_actions_jobs(m)
+            return
+        m = _REPO_RE.match(path)
+        if m is not None:
+            self.handle_repository(m)
+            return
+        self.send_json_response({"message": "Not Found"}, 404)
+
+    def handle_repository(self, m):
+        repo_name = m["owner"] + "/" + m["repo"]
+        blob = _REPO_BYTES.get(repo_name)
+        if blob is None:
+            repository = REPOSITORIES.setdefault(
+                repo_name, _make_repository(1, repo_name, ""))
+            blob = _REPO_BYTES[repo_name] = orjson.dumps(
+                repository, option=_DUMPS_OPTS)
+        self.send_raw_json(blob)
+
+    def handle_actions_runs(self, m, query):
+        repo_name = m["owner"] + "/" + m["repo"]
+        run_id = m["run_id"]
+
+        if run_id is None:
+            # /repos/{owner}/{repo}/actions/runs
+            branch = query.get("branch")
+            per_page = int(query.get("per_page", "30"))
+            runs = [run for run in WORKFLOW_RUNS.values()
+                    if run["repository"]["full_name"] == repo_name
+                    and (branch is None or run["head_branch"] == branch)]
+            if not runs and branch is not None:
+                # Fabricate a fresh set of runs for a branch nothing has
+                # asked about before.
+                for _ in range(3):
+                    run_id = next(_RUN_IDS)
+                    run = _store_run(run_id, generate_workflow_run(
+                        run_id, repo_name, branch))
+                    runs.append(run)
+            runs = runs[:per_page]
+            self.send_json_response({"total_count": len(runs),
+                                     "workflow_runs": runs})
+        elif m["jobs"] is None:
+            # /repos/{owner}/{repo}/actions/runs/{run_id}
+            run_id = int(run_id)
+            if run_id not in WORKFLOW_RUNS:
+                _store_run(run_id, generate_workflow_run(
+                    run_id, repo_name, "main"))
+            etag = _ETAGS[run_id]
+            if self.headers.get("If-None-Match") == etag:
+                self.send_not_modified(etag)
+                return
+            self.send_raw_json(_SERIALIZED[run_id], etag=etag)
+        else:
+            # /repos/{owner}/{repo}/actions/runs/{run_id}/jobs
+            jobs = jobs_for_run(int(run_id), repo_name)
+            self.send_json_response({"total_count": len(jobs),
+                                     "jobs": jobs})
+
+    def handle_actions_jobs(self, m):
+        repo_name = m["owner"] + "/" + m["repo"]
+        job_id = int(m["job_id"])
+        job = _JOBS_BY_ID.get(job_id)
+        if job is None:
+            jobs_for_run(job_id // 10, repo_name)
+            job = _JOBS_BY_ID.get(job_id)
+        if job is not None:
+            self.send_json_response(job)
+            return
+        self.send_json_response({"message": "Not Found"}, 404)
+
+    def log_message(self, format, *args):
+        pass
+
+
+def main():
+    # Workflow runs are fabricated on first request (see
+    # handle_actions_runs) and repositories are serialized at import,
+    # so there is nothing to seed here.
+    server = ThreadingHTTPServer(("", LISTEN_PORT), GitHubHandler)
+    print(f"fake github api listening on port {LISTEN_PORT}")
+    server.serve_forever()
+
+
+if __name__ == "__main__":
+    main()
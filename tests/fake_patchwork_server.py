@@ -0,0 +1,390 @@
+#!/usr/bin/env python3
+# SPDX-Identifier: gpl-2.0-or-later
+# Copyright (C) 2026, Red Hat, Inc.
+#
+# Fake Patchwork REST API server for exercising the pw-ci monitors.
+#
+# Licensed under the terms of the GNU General Public License as published
+# by the Free Software Foundation; either version 2 of the License, or
+# (at your option) any later version.  You may obtain a copy of the
+# license at
+#
+#    https://www.gnu.org/licenses/old-licenses/gpl-2.0.html
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# License for the specific language governing permissions and limitations
+# under the License.
+
+"""Serves just enough of the Patchwork 2 REST API for pw_mon and the
+CI monitors to poll localhost instead of a real instance.  Endpoints:
+
+   /api/series/?project=...&state=...
+   /api/series/{series_id}/
+   /api/patches/{patch_id}/
+   /api/patches/{patch_id}/comments/
+   /api/events/?category=...
+
+Series and patches are fabricated on demand and remembered, so a test
+can fetch a series it has never mentioned before and then re-fetch
+pieces of it coherently.
+"""
+
+import os
+import random
+from collections import defaultdict
+from datetime import datetime, timedelta
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+# Responses are consumed programmatically, so emit compact JSON;
+# indentation roughly doubles the bytes and the encode cost.  Set
+# PWCI_FAKE_SERVER_DEBUG for human-readable output.
+_INDENT = 2 if os.environ.get("PWCI_FAKE_SERVER_DEBUG") else 0
+
+# orjson serializes datetime natively and returns bytes; ujson is the
+# next-fastest codec for builds that cannot take orjson's Rust wheel,
+# and stdlib json (with default=str for the datetimes) always works.
+try:
+    import orjson
+
+    _DUMPS_OPTS = orjson.OPT_INDENT_2 if _INDENT else 0
+
+    def _dumps(data):
+        return orjson.dumps(data, option=_DUMPS_OPTS)
+except ImportError:
+    try:
+        import ujson
+
+        def _dumps(data):
+            return ujson.dumps(data, indent=_INDENT,
+                               default=str).encode("utf-8")
+    except ImportError:
+        import json
+
+        def _dumps(data):
+            return json.dumps(data, indent=_INDENT or None,
+                              default=str).encode("utf-8")
+
+BASE_URL = "http://localhost:8000"
+BASE_API = BASE_URL + "/api"
+LISTEN_PORT = 8000
+
+PROJECT = {"id": 1, "url": f"{BASE_URL}/api/projects/1/",
+           "name": "Test Project", "link_name": "test-project",
+           "list_id": "test.lists.example.com",
+           "list_email": "test@lists.example.com"}
+
+SUBMITTERS = [
+    ("Alice Example", "alice@example.com"),
+    ("Bob Tester", "bob@example.com"),
+    ("Carol Dev", "carol@example.com"),
+    ("Dave Hacker", "dave@example.com"),
+]
+
+PATCH_STATES = ["new", "under-review", "accepted", "rejected",
+                "superseded", "awaiting-upstream"]
+
+COMMENT_SNIPPETS = [
+    "Looks good to me.",
+    "Acked-by: Alice Example <alice@example.com>",
+    "Please fix the checkpatch warnings.",
+    "recheck-request: github-robot",
+    "Series applied, thanks!",
+]
+
+# series_id -> series object / patch_id -> patch object.  Populated at
+# startup and extended whenever a request fabricates new data.
+SERIES_DATA = {}
+PATCH_DATA = {}
+
+# patch state -> series ids with at least one patch in that state,
+# maintained as patches are generated so state-filtered listings are a
+# set lookup instead of a scan over every patch.
+STATE_TO_SERIES = defaultdict(set)
+
+# (path, sorted query items) -> serialized response bytes.  Repeat GETs
+# for the same resource skip generation and JSON encoding entirely.
+RESPONSE_CACHE = {}
+
+# series_id -> saved random.Random state.  Each series gets its own
+# deterministic stream seeded from its id; caching the state lets later
+# generation for the same series resume the stream instead of
+# re-seeding, so a given series always produces the same data.
+_RNG_STATE = {}
+
+_HOURS = range(1, 73)
+_MINUTES = range(5, 601)
+
+
+def _series_rng(series_id):
+    rng = random.Random()
+    state = _RNG_STATE.get(series_id)
+    if state is not None:
+        rng.setstate(state)
+    else:
+        rng.seed(series_id)
+    return rng
+
+
+def _save_rng(series_id, rng):
+    _RNG_STATE[series_id] = rng.getstate()
+
+
+def _cache_key(path, query):
+    return (path, tuple(sorted((k, tuple(v)) for k, v in query.items())))
+
+
+def generate_patch(patch_id, series_id, number, total,
+                   submitter=None, state=None, hours=None):
+    """Build a plausible Patchwork patch object and remember it.
+
+    generate_series draws the random fields for a whole series in one
+    batch and passes them in; a standalone call draws them itself from
+    the series stream.
+    """
+    if submitter is None:
+        rng = _series_rng(series_id)
+        submitter = rng.choice(SUBMITTERS)
+        state = rng.choice(PATCH_STATES)
+        hours = rng.choice(_HOURS)
+        _save_rng(series_id, rng)
+    name, email = submitter
+    date = datetime.now() - timedelta(hours=hours)
+    # Plain concatenation of pre-stringified ids beats re-running the
+    # f-string formatter for each of the many URLs below.
+    pid_s = str(patch_id)
+    sid_s = str(series_id)
+    url = BASE_API + "/patches/" + pid_s + "/"
+    patch = {
+        "id": patch_id,
+        "url": url,
+        "web_url": BASE_URL + "/patch/" + pid_s + "/",
+        "project": PROJECT,
+        "msgid": "<" + sid_s + "-" + pid_s + "@example.com>",
+        "date": date,
+        "name": f"[PATCH {number}/{total}] test patch {patch_id}",
+        "commit_ref": None,
+        "pull_url": None,
+        "state": state,
+        "archived": False,
+        "hash": "sha256:" + pid_s.zfill(64),
+        "submitter": {"id": patch_id % 100, "name": name, "email": email},
+        "delegate": None,
+        "mbox": url + "mbox/",
+        "series": [{"id": series_id,
+                    "url": BASE_API + "/series/" + sid_s + "/",
+                    "name": "test series " + sid_s}],
+        "comments": url + "comments/",
+        "check": "pending",
+        "checks": url + "checks/",
+    }
+    PATCH_DATA[patch_id] = patch
+    STATE_TO_SERIES[state].add(series_id)
+    return patch
+
+
+def generate_series(series_id):
+    """Build a plausible Patchwork series object and remember it."""
+    rng = _series_rng(series_id)
+    num_patches = rng.randint(1, 5)
+    # One batched draw per field for the whole series instead of a
+    # Mersenne Twister step per patch per field.
+    submitters = rng.choices(SUBMITTERS, k=num_patches + 1)
+    states = rng.choices(PATCH_STATES, k=num_patches)
+    hours = rng.choices(_HOURS, k=num_patches + 1)
+    _save_rng(series_id, rng)
+    name, email = submitters[-1]
+    date = datetime.now() - timedelta(hours=hours[-1])
+    patches = []
+    for number in range(1, num_patches + 1):
+        patch_id = series_id * 100 + number
+        patch = generate_patch(patch_id, series_id, number, num_patches,
+                               submitter=submitters[number - 1],
+                               state=states[number - 1],
+                               hours=hours[number - 1])
+        patches.append({"id": patch["id"], "url": patch["url"],
+                        "web_url": patch["web_url"],
+                        "msgid": patch["msgid"], "name": patch["name"],
+                        "mbox": patch["mbox"]})
+    sid_s = str(series_id)
+    url = BASE_API + "/series/" + sid_s + "/"
+    series = {
+        "id": series_id,
+        "url": url,
+        "web_url": BASE_URL + "/project/test-project/list/?series=" + sid_s,
+        "project": PROJECT,
+        "name": "test series " + sid_s,
+        "date": date,
+        "submitter": {"id": series_id % 100, "name": name, "email": email},
+        "version": 1,
+        "total": num_patches,
+        "received_total": num_patches,
+        "received_all": True,
+        "mbox": url + "mbox/",
+        "cover_letter": None,
+        "patches": patches,
+    }
+    SERIES_DATA[series_id] = series
+    return series
+
+
+def generate_comments(patch_id):
+    """Build a comment thread for a patch."""
+    rng = _series_rng(patch_id // 100)
+    count = rng.randint(0, 3)
+    submitters = rng.choices(SUBMITTERS, k=count)
+    minutes = rng.choices(_MINUTES, k=count)
+    snippets = rng.choices(COMMENT_SNIPPETS, k=count)
+    _save_rng(patch_id // 100, rng)
+    comments = []
+    for number in range(count):
+        name, email = submitters[number]
+        date = datetime.now() - timedelta(minutes=minutes[number])
+        comments.append({
+            "id": patch_id * 10 + number,
+            "web_url": f"{BASE_URL}/comment/{patch_id * 10 + number}/",
+            "msgid": f"<c{patch_id}-{number}@example.com>",
+            "date": date,
+            "subject": f"Re: test patch {patch_id}",
+            "submitter": {"id": number, "name": name, "email": email},
+            "content": snippets[number],
+        })
+    return comments
+
+
+def generate_events(category):
+    """Build recent events referencing the known series."""
+    events = []
+    minutes = random.choices(_MINUTES, k=len(SERIES_DATA))
+    for number, series_id in enumerate(sorted(SERIES_DATA)):
+        date = datetime.now() - timedelta(minutes=minutes[number])
+        events.append({
+            "id": 50000 + number,
+            "category": category or "series-completed",
+            "project": PROJECT,
+            "date": date,
+            "payload": {"series": {
+                "id": series_id,
+                "url": f"{BASE_URL}/api/series/{series_id}/",
+                "name": f"test series {series_id}"}},
+        })
+    return events
+
+
+_STATUS_LINES = {
+    200: b"HTTP/1.1 200 OK\r\n",
+    404: b"HTTP/1.1 404 Not Found\r\n",
+}
+
+_STATIC_HEADERS = (b"Content-Type: application/json\r\n"
+                   b"Access-Control-Allow-Origin: *\r\n"
+                   b"Content-Length: ")
+
+
+class PatchworkHandler(BaseHTTPRequestHandler):
+
+    # HTTP/1.1 plus the always-present Content-Length lets clients
+    # keep their connection open across polls instead of paying a TCP
+    # handshake per request.
+    protocol_version = "HTTP/1.1"
+
+    def send_json_response(self, data, status=200, cache_key=None,
+                           cache_p=1.0):
+        response = _dumps(data)
+        if cache_key is not None and random.random() < cache_p:
+            RESPONSE_CACHE[cache_key] = response
+        self.send_cached_response(response, status)
+
+    def send_cached_response(self, response, status=200):
+        # One assembled write per response instead of a send_header
+        # call (and potential syscall) per header line.
+        self.wfile.write(_STATUS_LINES[status] + _STATIC_HEADERS
+                         + str(len(response)).encode("ascii")
+                         + b"\r\n\r\n" + response)
+
+    def do_GET(self):
+        parsed = urlparse(self.path)
+        path = parsed.path
+        query = parse_qs(parsed.query)
+
+        if path.startswith("/api/series"):
+            self.handle_series(path, query)
+        elif path.startswith("/api/patches"):
+            self.handle_patches(path, query)
+        elif path.startswith("/api/events"):
+            self.handle_events(query)
+        else:
+            self.send_json_response({"detail": "Not found."}, 404)
+
+    def handle_series(self, path, query):
+        key = _cache_key(path, query)
+        cached = RESPONSE_CACHE.get(key)
+        if cached is not None:
+            self.send_cached_response(cached)
+            return
+        path_parts = path.strip("/").split("/")
+        if len(path_parts) == 2:
+            # /api/series/ - list filtered by patch state
+            states = query.get("state", ["new"])
+            candidates = set().union(*(STATE_TO_SERIES[state]
+                                       for state in states))
+            series_list = [SERIES_DATA[series_id]
+                           for series_id in sorted(candidates)
+                           if series_id in SERIES_DATA]
+            # Listings are randomized; cache only sometimes so the
+            # first few hits stay varied but repeats become O(1).
+            self.send_json_response(series_list, cache_key=key, cache_p=0.3)
+        else:
+            # /api/series/{series_id}/
+            series_id = int(path_parts[2])
+            series = SERIES_DATA.get(series_id)
+            if series is None:
+                series = generate_series(series_id)
+            self.send_json_response(series, cache_key=key)
+
+    def handle_patches(self, path, query):
+        key = _cache_key(path, query)
+        cached = RESPONSE_CACHE.get(key)
+        if cached is not None:
+            self.send_cached_response(cached)
+            return
+        path_parts = path.strip("/").split("/")
+        if len(path_parts) < 3:
+            self.send_json_response({"detail": "Not found."}, 404)
+            return
+        patch_id = int(path_parts[2])
+        if len(path_parts) == 4 and path_parts[3] == "comments":
+            # /api/patches/{patch_id}/comments/
+            self.send_json_response(generate_comments(patch_id),
+                                    cache_key=key, cache_p=0.3)
+            return
+        # /api/patches/{patch_id}/
+        patch = PATCH_DATA.get(patch_id)
+        if patch is None:
+            patch = generate_patch(patch_id, patch_id // 100, 1, 1)
+        self.send_json_response(patch, cache_key=key)
+
+    def handle_events(self, query):
+        category = query.get("category", [None])[0]
+        self.send_json_response(generate_events(category))
+
+    def log_message(self, format, *args):
+        pass
+
+
+def main():
+    # Seed a handful of series so list queries return familiar ids.
+    for series_id in range(1000, 1005):
+        generate_series(series_id)
+
+    server = ThreadingHTTPServer(("", LISTEN_PORT), PatchworkHandler)
+    # Handler threads must not block shutdown on Ctrl-C.
+    server.daemon_threads = True
+    print(f"fake patchwork api listening on port {LISTEN_PORT}")
+    server.serve_forever()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,201 @@
+# SPDX-Identifier: gpl-2.0-or-later
+# Copyright (C) 2026, Red Hat, Inc.
+#
+# Licensed under the terms of the GNU General Public License as published
+# by the Free Software Foundation; either version 2 of the License, or
+# (at your option) any later version.  You may obtain a copy of the
+# license at
+#
+#    https://www.gnu.org/licenses/old-licenses/gpl-2.0.html
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# License for the specific language governing permissions and limitations
+# under the License.
+
+"""Unit tests for pwci.database against a throwaway SQLite file."""
+
+import tempfile
+from pathlib import Path
+
+import pytest
+
+from pwci.database import SeriesDatabase
+
+PW = "http://pw.example.com"
+
+
+@pytest.fixture(scope="module")
+def _module_db():
+    """One in-memory SeriesDatabase for the module: schema DDL and
+    connection setup run once, not per test."""
+    db = SeriesDatabase(":memory:")
+    yield db
+    db.close()
+
+
+@pytest.fixture
+def temp_db(_module_db):
+    """The shared database, emptied before each test.
+
+    Nothing here cares about on-disk layout or recovery, so skipping
+    the filesystem removes every sync and unlink from the hot path;
+    a DELETE sweep gives each test a clean slate far cheaper than a
+    fresh file plus CREATE TABLE/INDEX.  The file-backed variant
+    below covers creation and pragmas.
+    """
+    _module_db._conn.executescript(
+        "DELETE FROM series;"
+        "DELETE FROM git_builds;"
+        "DELETE FROM recheck_requests;"
+        "DELETE FROM check_id_scanned;"
+        "DELETE FROM pw_monitor_state;")
+    return _module_db
+
+
+@pytest.fixture
+def temp_db_file():
+    """A SeriesDatabase on a fresh file, removed after the test.
+
+    SeriesDatabase opens its connection in WAL mode with
+    synchronous=NORMAL, so writes here never pay a per-commit fsync;
+    cleanup has to collect the -wal/-shm sidecars WAL leaves behind.
+    """
+    with tempfile.NamedTemporaryFile(suffix=".db", delete=False) as handle:
+        db_path = Path(handle.name)
+    db = SeriesDatabase(str(db_path))
+    yield db
+    db.close()
+    for sidecar in ("", "-wal", "-shm"):
+        Path(str(db_path) + sidecar).unlink(missing_ok=True)
+
+
+def test_database_creation(temp_db_file):
+    temp_db = temp_db_file
+    assert Path(temp_db.db_path).exists()
+    assert temp_db._conn.execute(
+        "PRAGMA journal_mode").fetchone()[0] == "wal"
+    # synchronous: 1 == NORMAL
+    assert temp_db._conn.execute(
+        "PRAGMA synchronous").fetchone()[0] == 1
+
+
+def test_schema_recreated_after_unlink(temp_db_file):
+    """Deleting the file must not leave a stale schema cache entry.
+
+    A second open on the same path has to notice the file is gone
+    and run the DDL again, or every query fails with no such table.
+    """
+    db_path = temp_db_file.db_path
+    temp_db_file.close()
+    for sidecar in ("", "-wal", "-shm"):
+        Path(db_path + sidecar).unlink(missing_ok=True)
+    db = SeriesDatabase(db_path)
+    assert not db.series_exists(PW, 1)
+    db.close()
+
+
+def test_one_connection_per_lifetime(monkeypatch):
+    """Many small calls must share the instance's one connection.
+
+    Re-connecting per method would repay pragma application and a
+    cold page cache on every call; count sqlite3.connect to make
+    sure that pattern cannot sneak back in.
+    """
+    import sqlite3
+    real_connect = sqlite3.connect
+    calls = []
+
+    def counting_connect(*args, **kwargs):
+        calls.append(args)
+        return real_connect(*args, **kwargs)
+
+    monkeypatch.setattr("pwci.database.sqlite3.connect",
+                        counting_connect)
+    db = SeriesDatabase(":memory:")
+    db.add_series(PW, "proj", 3, PW + "/api/series/3/", "D", "d@x")
+    assert db.series_exists(PW, 3)
+    list(db.get_uncompleted_series(PW))
+    db.set_series_completed(PW, 3)
+    db.close()
+    assert len(calls) == 1
+
+
+def test_series_operations(temp_db):
+    assert not temp_db.series_exists(PW, 1)
+    # One transaction around the whole write chain: the per-call
+    # commits collapse into a single one at block exit.
+    with temp_db.transaction():
+        temp_db.add_series(PW, "proj", 1, PW + "/api/series/1/",
+                           "Alice", "alice@example.com")
+        assert temp_db.series_exists(PW, 1)
+
+        rows = list(temp_db.get_unsubmitted_series(PW))
+        assert [row["series_id"] for row in rows] == [1]
+        temp_db.set_series_submitted(PW, 1)
+        assert list(temp_db.get_unsubmitted_series(PW)) == []
+
+        rows = list(temp_db.get_uncompleted_series(PW))
+        assert [row["series_id"] for row in rows] == [1]
+        temp_db.set_series_completed(PW, 1)
+    assert list(temp_db.get_uncompleted_series(PW)) == []
+
+
+def test_build_operations(temp_db):
+    with temp_db.transaction():
+        temp_db.add_series(PW, "proj", 5, PW + "/api/series/5/",
+                           "Bob", "bob@example.com")
+        temp_db.add_build(5, 50, PW + "/api/patches/50/", "a patch",
+                          "abc123", PW, "proj", "repo")
+
+    assert temp_db.get_patch_id_by_series_and_sha(PW, 5, "abc123") == 50
+    assert temp_db.get_patch_id_by_series_and_sha(PW, 5, "zzz") is None
+
+    rows = list(temp_db.get_unsynced_builds(PW, "gap_sync"))
+    assert [row["patch_id"] for row in rows] == [50]
+    temp_db.set_build_synced(PW, 50, "gap_sync")
+    assert list(temp_db.get_unsynced_builds(PW, "gap_sync")) == []
+
+    info = temp_db.get_cached_patch_info(PW, 5, 50)
+    assert info["url"] == PW + "/api/patches/50/"
+    assert info["submitter"]["email"] == "bob@example.com"
+
+
+def test_bulk_insert_builds(temp_db):
+    """insert_builds seeds a whole series in one executemany and one
+    commit; set_builds_synced clears it with one UPDATE."""
+    temp_db.add_series(PW, "proj", 7, PW + "/api/series/7/",
+                       "Eve", "eve@example.com")
+    rows = [(7, patch_id, "%s/api/patches/%d/" % (PW, patch_id),
+             "patch %d" % patch_id, "sha%d" % patch_id,
+             PW, "proj", "repo")
+            for patch_id in range(70, 75)]
+    temp_db.insert_builds(rows)
+
+    unsynced = list(temp_db.get_unsynced_builds(PW, "gap_sync"))
+    assert [row["patch_id"] for row in unsynced] \
+        == list(range(70, 75))
+
+    temp_db.set_builds_synced(PW, [70, 71, 72, 73, 74], "gap_sync")
+    assert list(temp_db.get_unsynced_builds(PW, "gap_sync")) == []
+
+    # Empty batches must be no-ops, not malformed SQL.
+    temp_db.insert_builds([])
+    temp_db.set_builds_synced(PW, [], "gap_sync")
+
+
+def test_branch_operations(temp_db):
+    # Deliberately autocommit: keeps the non-transaction() write
+    # path covered.
+    temp_db.add_series(PW, "proj", 9, PW + "/api/series/9/",
+                       "Carol", "carol@example.com")
+    assert list(temp_db.get_active_branches(PW)) == []
+
+    temp_db.activate_branch(PW, 9, "repo", "series_9")
+    rows = list(temp_db.get_active_branches(PW))
+    assert [(row["series_id"], row["series_branch"]) for row in rows] \
+        == [(9, "series_9")]
+
+    temp_db.clear_branch(PW, 9)
+    assert list(temp_db.get_active_branches(PW)) == []
@@ -0,0 +1,214 @@
+# SPDX-Identifier: gpl-2.0-or-later
+# Copyright (C) 2026, Red Hat, Inc.
+#
+# Licensed under the terms of the GNU General Public License as published
+# by the Free Software Foundation; either version 2 of the License, or
+# (at your option) any later version.  You may obtain a copy of the
+# license at
+#
+#    https://www.gnu.org/licenses/old-licenses/gpl-2.0.html
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# License for the specific language governing permissions and limitations
+# under the License.
+
+"""CLI smoke tests against the fake Patchwork server.
+
+The commands run in-process through click's CliRunner, so the whole
+suite pays interpreter startup and imports once instead of once per
+`python -m pwci.cli` invocation; a single cold-start test keeps the
+module entry point itself covered.
+"""
+
+import hashlib
+import os
+import subprocess
+import sys
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from pathlib import Path
+
+import pytest
+import requests
+from click.testing import CliRunner
+
+from pwci.cli import _FACTORIES, cli
+
+# On CI nobody reads the subprocess chatter; PWCI_TEST_QUIET=1 sends
+# it to /dev/null so the parent never allocates output buffers.
+QUIET = os.environ.get("PWCI_TEST_QUIET") == "1"
+
+PW_URL = "http://127.0.0.1:8000"
+SERVER = Path(__file__).parent / "fake_patchwork_server.py"
+
+RC_CONTENT = """\
+pw_instance=%s
+pw_project=test-project
+pw_credential=tester:secret
+to_addr=to@example.com
+from_addr=from@example.com
+RPT_SUCCESS=SUCCESS
+RPT_FAILURE=FAILURE
+RPT_WARNING=WARNING
+post_result_script=no
+disable_dummy=no
+dummy_token=emit
+""" % PW_URL
+
+# The group starts empty; commands are normally registered from argv.
+for _factory in _FACTORIES.values():
+    cli.add_command(_factory())
+
+
+# One session for every probe; the localhost TCP connection is set
+# up once instead of per health check.
+SESSION = requests.Session()
+SESSION.mount("http://", requests.adapters.HTTPAdapter(
+    pool_connections=1, pool_maxsize=4))
+
+
+def check_server_running():
+    """Probe the fake server's series endpoint."""
+    try:
+        response = SESSION.get(PW_URL + "/api/series/1000/", timeout=1)
+    except requests.RequestException:
+        return False
+    return response.status_code == 200
+
+
+def _wait_ready(attempts=8, base=0.05):
+    """Poll until the server answers, backing off exponentially.
+
+    Returns as soon as the server is up, instead of an unconditional
+    one second sleep that mostly overshoots localhost startup.
+    """
+    delay = base
+    for _ in range(attempts):
+        if check_server_running():
+            return True
+        time.sleep(delay)
+        delay *= 2
+    return False
+
+
+def run_command(cmd, description):
+    """Run one command in a fresh interpreter, returning success.
+
+    Output stays as bytes and is forwarded straight to the raw
+    streams; text=True would decode the whole capture up front even
+    when both streams are empty.
+    """
+    if not QUIET:
+        print("Running: %s" % description)
+    stream = subprocess.DEVNULL if QUIET else subprocess.PIPE
+    result = subprocess.run(cmd, stdout=stream, stderr=stream,
+                            timeout=30)
+    if result.stdout:
+        sys.stdout.buffer.write(result.stdout)
+    if result.stderr:
+        sys.stderr.buffer.write(result.stderr)
+    return result.returncode == 0
+
+
+@pytest.fixture(scope="module", autouse=True)
+def fake_server():
+    """The fake Patchwork server, shared by every test here."""
+    stream = subprocess.DEVNULL if QUIET else subprocess.PIPE
+    proc = subprocess.Popen([sys.executable, str(SERVER)],
+                            stdout=stream, stderr=stream)
+    if not _wait_ready():
+        proc.terminate()
+        pytest.skip("fake patchwork server did not come up")
+    yield
+    proc.terminate()
+    proc.wait(timeout=10)
+
+
+@pytest.fixture(scope="module", autouse=True)
+def rc_file():
+    """The RC file the CLI commands read, written once per content.
+
+    Lives under the system tmpdir (RAM-backed on most Linux CI)
+    instead of $HOME, named by a digest of its content so repeated
+    runs skip the write entirely; os.replace keeps it atomic for
+    anything racing us.
+    """
+    digest = hashlib.sha1(RC_CONTENT.encode()).hexdigest()
+    path = Path(tempfile.gettempdir()) / (".pwmon-test-rc.%s" % digest)
+    if not path.exists():
+        scratch = path.with_suffix(".tmp")
+        scratch.write_text(RC_CONTENT)
+        os.replace(scratch, path)
+    yield str(path)
+
+
+@pytest.fixture(scope="module", autouse=True)
+def isolated_home(tmp_path_factory):
+    """Point $HOME at a scratch directory for the whole module.
+
+    The smoke commands open the default ~/.series-db — the same file
+    the production shell scripts use — so they must never see the
+    developer's real home.  default_db_path() resolves per call, and
+    the env change is inherited by the cold-start subprocess too.
+    """
+    home = tmp_path_factory.mktemp("home")
+    patcher = pytest.MonkeyPatch()
+    patcher.setenv("HOME", str(home))
+    yield str(home)
+    patcher.undo()
+
+
+def invoke(args):
+    return CliRunner().invoke(cli, args)
+
+
+def test_cli_cold_start():
+    assert run_command([sys.executable, "-m", "pwci.cli", "--help"],
+                       "pwci.cli --help in a fresh interpreter")
+
+
+def test_series_info(rc_file):
+    result = invoke(["series-info", "1000",
+                     "--config-file", rc_file])
+    assert result.exit_code == 0, result.output
+    assert result.output.startswith("1000|")
+
+
+# Independent smoke commands; they all just hit the fake server and
+# the shared DB, so they can run in parallel.
+CLI_TESTS = [
+    (["monitor"], "monitor"),
+    (["list-series"], "list-series"),
+    (["ci-monitor", "--providers", "dummy", "--dry-run"],
+     "ci-monitor dry run"),
+]
+
+
+def _invoke_quiet(args):
+    """Run one command in this thread; success as a bool.
+
+    CliRunner swaps the process-wide stdout and is not thread-safe,
+    so the concurrent path calls the group directly; output goes to
+    the real streams uncaptured.
+    """
+    try:
+        cli.main(args, standalone_mode=False)
+    except Exception:
+        return False
+    return True
+
+
+def test_cli_commands_concurrent(rc_file):
+    """The smoke commands together take max(), not sum(), of their
+    times: each one mostly waits on the fake server."""
+    with ThreadPoolExecutor(max_workers=len(CLI_TESTS)) as executor:
+        futures = {
+            executor.submit(_invoke_quiet,
+                            args + ["--config-file", rc_file]):
+            description for args, description in CLI_TESTS}
+        failed = [futures[future] for future in as_completed(futures)
+                  if not future.result()]
+    assert not failed, "commands failed: %s" % ", ".join(failed)